@@ -1,79 +1,401 @@
 import datetime
 import csv
+import json
+import os
+import sys
+import base64
+import bisect
+import gzip
+import io
+import time
+import threading
+import contextlib
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-# Step 1: Define the BankAccount class
+# Files used to persist accounts between runs
+LEDGER_FILE = "bank_ledger.log"
+SNAPSHOT_FILE = "bank_snapshot.json"
+SNAPSHOT_EVERY = 1000  # fewest records between snapshots (see Ledger)
+
+# Statement export tuning
+EXPORT_BATCH_ROWS = 10000      # rows formatted per write
+EXPORT_BUFFER_SIZE = 1 << 20   # 1 MB file buffer
+EXPORT_WORKERS = 4             # accounts exported at once by export_statements
+
+# Batch posting
+POSTING_WORKERS = 4            # threads used by TransactionEngine
+INGEST_BATCH_ROWS = 100000     # CSV rows posted per batch by ingest_csv
+INGEST_COLUMNS = ('type', 'account', 'amount')  # required CSV columns; target is optional
+
+# Step 1: Columnar transaction storage
+# Transactions are kept in parallel typed arrays (epoch timestamp, type code,
+# amount) instead of a list of tuples: ~25 bytes per row instead of ~200.
+# Running balances are not stored per row; they come from a Fenwick tree over
+# the amounts, so editing or voiding any row is O(log n) and every later
+# balance stays correct. Timestamps never decrease, so date lookups are a
+# bisect over the times column. Indexing and iteration still yield
+# (datetime, type, amount, balance) tuples, so callers treat it like a list.
+TRANSACTION_TYPES = ('Deposit', 'Withdrawal', 'Void', 'Xfer Out', 'Xfer In')
+TYPE_CODES = {t_type: code for code, t_type in enumerate(TRANSACTION_TYPES)}
+
+# Fenwick (binary indexed) tree: prefix sums with O(log n) point updates
+class FenwickTree:
+    def __init__(self):
+        self.tree = array('d', [0.0])  # 1-based; slot 0 is unused
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    # Sum of the first n values
+    def prefix(self, n):
+        tree = self.tree
+        total = 0.0
+        while n > 0:
+            total += tree[n]
+            n &= n - 1
+        return total
+
+    # Add delta to the value at 0-based index i
+    def add(self, i, delta):
+        tree = self.tree
+        size = len(tree)
+        i += 1
+        while i < size:
+            tree[i] += delta
+            i += i & -i
+
+    def append(self, value):
+        k = len(self.tree)
+        # Node k covers values (k - lowbit(k), k]; all but the new one exist already
+        self.tree.append(value + self.prefix(k - 1) - self.prefix(k - (k & -k)))
+
+class TransactionStore:
+    def __init__(self):
+        self.times = array('d')
+        self.types = array('B')
+        self.amounts = array('d')
+        self.sums = FenwickTree()
+        self.deposit_rows = array('q')  # indices of deposit rows, ascending
+
+    def __len__(self):
+        return len(self.times)
+
+    # Running balance after row i, O(log n)
+    def balance_after(self, i):
+        return self.sums.prefix(i + 1)
+
+    def _row(self, i):
+        return (
+            datetime.datetime.fromtimestamp(self.times[i]),
+            TRANSACTION_TYPES[self.types[i]],
+            self.amounts[i],
+            self.balance_after(i),
+        )
+
+    def _index(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("transaction index out of range")
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._row(j) for j in range(*i.indices(len(self)))]
+        return self._row(self._index(i))
+
+    def __iter__(self):
+        return self.rows(0, len(self))
+
+    # Rows lo..hi-1; the scan keeps its own running total instead of querying the tree
+    def rows(self, lo, hi):
+        fromtimestamp = datetime.datetime.fromtimestamp
+        balance = self.sums.prefix(lo)
+        for i in range(lo, hi):
+            amount = self.amounts[i]
+            balance += amount
+            yield fromtimestamp(self.times[i]), TRANSACTION_TYPES[self.types[i]], amount, balance
+
+    # Row range [lo, hi) with start <= time <= end; None leaves that side open
+    def bounds(self, start=None, end=None):
+        lo = 0 if start is None else bisect.bisect_left(self.times, start.timestamp())
+        hi = len(self) if end is None else bisect.bisect_right(self.times, end.timestamp())
+        return lo, max(lo, hi)
+
+    def between(self, start=None, end=None):
+        return self.rows(*self.bounds(start, end))
+
+    # Balance as of a point in time, O(log n)
+    def balance_at(self, when):
+        return self.sums.prefix(bisect.bisect_right(self.times, when.timestamp()))
+
+    # The balance in the row is derived, so only the first three fields are stored
+    def append(self, row):
+        when, t_type, amount = row[:3]
+        if TYPE_CODES[t_type] == TYPE_CODES['Deposit']:
+            self.deposit_rows.append(len(self.times))
+        ts = when.timestamp()
+        if self.times and ts < self.times[-1]:
+            ts = self.times[-1]  # clock stepped back; keep the index sorted
+        self.times.append(ts)
+        self.types.append(TYPE_CODES[t_type])
+        self.amounts.append(amount)
+        self.sums.append(amount)
+
+    # Replace the signed amount of row i; returns the old amount
+    def set_amount(self, i, amount):
+        i = self._index(i)
+        old_amount = self.amounts[i]
+        self.amounts[i] = amount
+        self.sums.add(i, amount - old_amount)
+        return old_amount
+
+    # Zero out row i and mark it void; returns the old amount
+    def void(self, i):
+        i = self._index(i)
+        if self.types[i] == TYPE_CODES['Deposit']:
+            pos = bisect.bisect_left(self.deposit_rows, i)
+            del self.deposit_rows[pos]
+        self.types[i] = TYPE_CODES['Void']
+        return self.set_amount(i, 0.0)
+
+    def last_deposit(self):
+        return self.deposit_rows[-1] if self.deposit_rows else None
+
+    # Raw column bytes for snapshots (base64 so they fit in JSON)
+    def to_dict(self):
+        columns = {"byteorder": sys.byteorder}
+        for name, column in self._columns():
+            columns[name] = base64.b64encode(column.tobytes()).decode('ascii')
+        return columns
+
+    def _columns(self):
+        return [('times', self.times), ('types', self.types), ('amounts', self.amounts),
+                ('sums', self.sums.tree), ('deposit_rows', self.deposit_rows)]
+
+    @classmethod
+    def from_dict(cls, data):
+        store = cls()
+        store.sums.tree = array('d')
+        for name, column in store._columns():
+            column.frombytes(base64.b64decode(data[name]))
+            if data["byteorder"] != sys.byteorder:
+                column.byteswap()
+        return store
+
+# Step 2: Define the BankAccount class
 class BankAccount:
-    def __init__(self, owner, account_number):
+    def __init__(self, owner, account_number, ledger=None):
         self.owner = owner
         self.account_number = account_number
         self.balance = 0.0
-        self.transactions = []
+        self.transactions = TransactionStore()
+        self.ledger = ledger
+        self.lock = threading.RLock()
+
+    # Write a record to the ledger (if this account is persisted)
+    def _log(self, op, *args):
+        if self.ledger is not None:
+            self.ledger.append(op, self.account_number, *args)
+
+    # Changes and their ledger records are made under the ledger lock, so a
+    # snapshot never contains a change whose record is still to be written.
+    # Always taken after the account locks.
+    def _ledger_lock(self):
+        return self.ledger.lock if self.ledger is not None else contextlib.nullcontext()
+
+    # Apply a balance change without validation or output (also used for replay)
+    def _post(self, t_type, amount, when):
+        self.balance += amount
+        self.transactions.append((when, t_type, amount, self.balance))
+
+    # Thread-safe deposit/withdrawal without output; returns an error message or None
+    def post_deposit(self, amount):
+        if not amount > 0:
+            return "Invalid deposit amount."
+        with self.lock, self._ledger_lock():
+            now = datetime.datetime.now()
+            self._post('Deposit', amount, now)
+            self._log('D', amount, now.timestamp())
+        return None
+
+    def post_withdrawal(self, amount):
+        with self.lock, self._ledger_lock():
+            if not 0 < amount <= self.balance:
+                return "Insufficient balance or invalid amount."
+            now = datetime.datetime.now()
+            self._post('Withdrawal', -amount, now)
+            self._log('W', amount, now.timestamp())
+        return None
 
     def deposit(self, amount):
-        if amount > 0:
-            self.balance += amount
-            self.transactions.append((datetime.datetime.now(), 'Deposit', amount, self.balance))
-            print(f"Deposited ₹{amount:.2f}")
-        else:
-            print("Invalid deposit amount.")
+        error = self.post_deposit(amount)
+        print(error or f"Deposited ₹{amount:.2f}")
 
     def withdraw(self, amount):
-        if 0 < amount <= self.balance:
-            self.balance -= amount
-            self.transactions.append((datetime.datetime.now(), 'Withdrawal', -amount, self.balance))
-            print(f"Withdrew ₹{amount:.2f}")
-        else:
-            print("Insufficient balance or invalid amount.")
+        error = self.post_withdrawal(amount)
+        print(error or f"Withdrew ₹{amount:.2f}")
 
     def check_balance(self):
         print(f"Current balance: ₹{self.balance:.2f}")
 
     def view_transactions(self):
         print("\nTransaction History:")
-        print("Date & Time           | Type       | Amount   | Balance")
-        print("----------------------------------------------------------")
-        for t in self.transactions:
+        print("No.   | Date & Time           | Type       | Amount   | Balance")
+        print("------------------------------------------------------------------")
+        for number, t in enumerate(self.transactions, 1):
             date, t_type, amount, bal = t
-            print(f"{date.strftime('%Y-%m-%d %H:%M:%S')} | {t_type:<10} | ₹{amount:>7.2f} | ₹{bal:>7.2f}")
+            print(f"{number:<5} | {date.strftime('%Y-%m-%d %H:%M:%S')} | {t_type:<10} | ₹{amount:>7.2f} | ₹{bal:>7.2f}")
+
+    # Transactions with start <= time <= end (either bound may be None)
+    def transactions_between(self, start=None, end=None):
+        return self.transactions.between(start, end)
+
+    def balance_at(self, when):
+        return self.transactions.balance_at(when)
 
-    def export_statement(self, filename, filetype='txt'):
+    # Write the statement in batches through a large buffer, gzip-compressed
+    # if requested. Returns (rows, bytes written, seconds).
+    def write_statement(self, filename, filetype='txt', start=None, end=None, compress=False):
+        began = time.perf_counter()
+        store = self.transactions
+        lo, hi = store.bounds(start, end)
+        raw = open(filename, 'wb', buffering=EXPORT_BUFFER_SIZE)
         try:
-            if filetype == 'csv':
-                with open(filename, 'w', newline='') as file:
+            stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) if compress else raw
+            newline = '' if filetype == 'csv' else None
+            with io.TextIOWrapper(stream, encoding='utf-8', newline=newline) as file:
+                if filetype == 'csv':
                     writer = csv.writer(file)
                     writer.writerow(['Date & Time', 'Type', 'Amount', 'Balance'])
-                    for t in self.transactions:
-                        writer.writerow([t[0].strftime('%Y-%m-%d %H:%M:%S'), t[1], t[2], t[3]])
-            else:
-                with open(filename, 'w') as file:
+                    for rows in self._statement_batches(lo, hi):
+                        writer.writerows(rows)
+                else:
                     file.write("Date & Time           | Type       | Amount   | Balance\n")
                     file.write("----------------------------------------------------------\n")
-                    for t in self.transactions:
-                        file.write(f"{t[0].strftime('%Y-%m-%d %H:%M:%S')} | {t[1]:<10} | ₹{t[2]:>7.2f} | ₹{t[3]:>7.2f}\n")
-            print(f"Statement saved to {filename}")
+                    for rows in self._statement_batches(lo, hi):
+                        file.write("".join([
+                            f"{date} | {t_type:<10} | ₹{amount:>7.2f} | ₹{bal:>7.2f}\n"
+                            for date, t_type, amount, bal in rows
+                        ]))
+                if compress:
+                    file.flush()
+                    stream.close()  # writes the gzip trailer; raw is closed below
+            if compress:
+                raw.flush()  # the trailer is still in raw's buffer
+            size = os.path.getsize(filename)
+        finally:
+            raw.close()
+        return hi - lo, size, time.perf_counter() - began
+
+    # Rows lo..hi-1 as (formatted date, type, amount, balance) lists, EXPORT_BATCH_ROWS at a time.
+    # Consecutive rows in the same second reuse the formatted date string.
+    def _statement_batches(self, lo, hi):
+        store = self.transactions
+        balance = store.sums.prefix(lo)
+        last_second = None
+        date = ""
+        for batch_start in range(lo, hi, EXPORT_BATCH_ROWS):
+            batch_end = min(batch_start + EXPORT_BATCH_ROWS, hi)
+            rows = []
+            for ts, code, amount in zip(store.times[batch_start:batch_end],
+                                        store.types[batch_start:batch_end],
+                                        store.amounts[batch_start:batch_end]):
+                second = int(ts)
+                if second != last_second:
+                    last_second = second
+                    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+                balance += amount
+                rows.append([date, TRANSACTION_TYPES[code], amount, balance])
+            yield rows
+
+    def export_statement(self, filename, filetype='txt', start=None, end=None, compress=None):
+        if compress is None:
+            compress = filename.endswith('.gz')
+        try:
+            rows, size, seconds = self.write_statement(filename, filetype, start, end, compress)
+            print(f"Statement saved to {filename} ({rows} rows, {size / 1e6:.2f} MB in {seconds:.2f}s)")
+            return rows, size, seconds
         except Exception as e:
             print(f"Error saving statement: {e}")
+            return None
 
     def edit_name(self, new_name):
-        self.owner = new_name
+        with self.lock, self._ledger_lock():
+            self.owner = new_name
+            self._log('N', new_name)
         print(f"Name updated to: {self.owner}")
 
     def edit_account_number(self, new_number):
-        self.account_number = new_number
+        with self.lock, self._ledger_lock():
+            old_number = self.account_number
+            self.account_number = new_number
+            # Logged after the change (a snapshot taken by this record must
+            # hold the new number), under the number the ledger knows
+            if self.ledger is not None:
+                self.ledger.append('A', old_number, new_number)
         print(f"Account number updated to: {self.account_number}")
 
+    # Change the amount of transaction i, keeping its sign; later balances follow
+    def _edit_transaction(self, i, new_amount):
+        store = self.transactions
+        sign = -1 if store.amounts[i] < 0 else 1
+        old_amount = store.set_amount(i, sign * new_amount)
+        self.balance += sign * new_amount - old_amount
+        return abs(old_amount)
+
+    def _void_transaction(self, i):
+        old_amount = self.transactions.void(i)
+        self.balance -= old_amount
+        return old_amount
+
     def edit_last_deposit(self, new_amount):
-        for i in reversed(range(len(self.transactions))):
-            if self.transactions[i][1] == 'Deposit':
-                old_amount = self.transactions[i][2]
-                self.balance -= old_amount
-                self.balance += new_amount
-                self.transactions[i] = (
-                    self.transactions[i][0], 'Deposit', new_amount, self.balance
-                )
-                print(f"Last deposit updated from ₹{old_amount:.2f} to ₹{new_amount:.2f}")
+        with self.lock, self._ledger_lock():
+            i = self.transactions.last_deposit()
+            if i is None:
+                print("No deposit transaction found to edit.")
                 return
-        print("No deposit transaction found to edit.")
+            old_amount = self._edit_transaction(i, new_amount)
+            self._log('T', i, new_amount)
+        print(f"Last deposit updated from ₹{old_amount:.2f} to ₹{new_amount:.2f}")
+
+    # Why transaction number n cannot be edited or voided, or None if it can
+    def _check_editable(self, number):
+        i = number - 1
+        if not 0 <= i < len(self.transactions):
+            return "Invalid transaction number."
+        code = self.transactions.types[i]
+        if code == TYPE_CODES['Void']:
+            return "Transaction is already void."
+        if code in (TYPE_CODES['Xfer Out'], TYPE_CODES['Xfer In']):
+            return "Transfers cannot be edited or voided."
+        return None
+
+    # Transaction numbers shown to the user start at 1
+    def edit_transaction(self, number, new_amount):
+        if new_amount <= 0:
+            print("Invalid amount.")
+            return
+        with self.lock, self._ledger_lock():
+            error = self._check_editable(number)
+            if error is None:
+                old_amount = self._edit_transaction(number - 1, new_amount)
+                self._log('T', number - 1, new_amount)
+        print(error or f"Transaction {number} updated from ₹{old_amount:.2f} to ₹{new_amount:.2f}")
+
+    def void_transaction(self, number):
+        with self.lock, self._ledger_lock():
+            error = self._check_editable(number)
+            if error is None:
+                old_amount = self._void_transaction(number - 1)
+                self._log('V', number - 1)
+        print(error or f"Transaction {number} of ₹{old_amount:.2f} voided.")
+
+    # Balance right after transaction number n, O(log n)
+    def balance_after(self, number):
+        return self.transactions.balance_after(number - 1)
 
     def view_profile(self):
         print("\n===== Account Profile =====")
@@ -87,18 +409,326 @@ class BankAccount:
         else:
             print("Last Transaction    : No transactions yet.")
 
-# Step 2: Create a new account
-def create_new_account(accounts):
+    # Serialize the account for a snapshot
+    def to_dict(self):
+        return {
+            "owner": self.owner,
+            "account_number": self.account_number,
+            "balance": self.balance,
+            "transactions": self.transactions.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data, ledger=None):
+        acc = cls(data["owner"], data["account_number"], ledger)
+        acc.balance = data["balance"]
+        acc.transactions = TransactionStore.from_dict(data["transactions"])
+        return acc
+
+# Step 3: Write-ahead ledger with periodic snapshots
+# Every change is appended to LEDGER_FILE as one compact JSON line:
+#   [seq, op, account_number, *args]
+# ops: C=create, D=deposit, W=withdraw, N=edit name, A=edit account number,
+#      T=edit transaction, V=void transaction, X=transfer to another account
+# Once the ledger holds at least SNAPSHOT_EVERY records and has grown as large
+# as the last snapshot, the full state is written to SNAPSHOT_FILE and the
+# ledger is truncated, so startup only replays the snapshot plus the tail.
+# Tying compaction to the snapshot size keeps its cost per record constant:
+# a snapshot of S bytes is only rewritten after S bytes of new records.
+class Ledger:
+    def __init__(self, ledger_file=LEDGER_FILE, snapshot_file=SNAPSHOT_FILE,
+                 snapshot_every=SNAPSHOT_EVERY):
+        self.ledger_file = ledger_file
+        self.snapshot_file = snapshot_file
+        self.snapshot_every = snapshot_every
+        self.accounts = {}
+        self.seq = 0
+        self.pending = 0
+        self.ledger_bytes = 0    # size of the ledger file
+        self.snapshot_bytes = 0  # size of the last snapshot
+        self.file = None
+        self.lock = threading.RLock()
+
+    def load(self):
+        accounts = {}
+        seq = 0
+        self.snapshot_bytes = 0
+        if os.path.exists(self.snapshot_file):
+            self.snapshot_bytes = os.path.getsize(self.snapshot_file)
+            with open(self.snapshot_file, "r") as file:
+                snapshot = json.load(file)
+            seq = snapshot["seq"]
+            for data in snapshot["accounts"]:
+                acc = BankAccount.from_dict(data, ledger=self)
+                accounts[acc.account_number] = acc
+
+        pending = 0
+        good_end = 0
+        if os.path.exists(self.ledger_file):
+            with open(self.ledger_file, "rb") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn write at the tail from a crash
+                    good_end += len(line)
+                    if record[0] <= seq:
+                        continue  # already contained in the snapshot
+                    self._apply(accounts, record)
+                    seq = record[0]
+                    pending += 1
+            # Drop any partial record so new appends start on a clean line
+            if good_end != os.path.getsize(self.ledger_file):
+                with open(self.ledger_file, "r+b") as file:
+                    file.truncate(good_end)
+
+        self.accounts = accounts
+        self.seq = seq
+        self.pending = pending
+        self.ledger_bytes = good_end
+        self.file = open(self.ledger_file, "a", encoding="utf-8")
+        return accounts
+
+    def _apply(self, accounts, record):
+        _, op, number, *args = record
+        if op == 'C':
+            accounts[number] = BankAccount(args[0], number, ledger=self)
+        elif op == 'D':
+            accounts[number]._post('Deposit', args[0], datetime.datetime.fromtimestamp(args[1]))
+        elif op == 'W':
+            accounts[number]._post('Withdrawal', -args[0], datetime.datetime.fromtimestamp(args[1]))
+        elif op == 'N':
+            accounts[number].owner = args[0]
+        elif op == 'A':
+            acc = accounts.pop(number)
+            acc.account_number = args[0]
+            accounts[args[0]] = acc
+        elif op == 'T':
+            accounts[number]._edit_transaction(args[0], args[1])
+        elif op == 'V':
+            accounts[number]._void_transaction(args[0])
+        elif op == 'X':
+            when = datetime.datetime.fromtimestamp(args[2])
+            accounts[number]._post('Xfer Out', -args[1], when)
+            accounts[args[0]]._post('Xfer In', args[1], when)
+
+    def append(self, op, number, *args):
+        with self.lock:
+            if self.file is None:
+                return
+            self.seq += 1
+            line = json.dumps([self.seq, op, number, *args], separators=(',', ':')) + "\n"
+            self.file.write(line)
+            self.file.flush()
+            self.pending += 1
+            self.ledger_bytes += len(line)  # json.dumps output is ASCII
+            if self.pending >= self.snapshot_every and self.ledger_bytes >= self.snapshot_bytes:
+                self.compact()
+
+    def compact(self):
+        with self.lock:
+            self._compact()
+
+    def _compact(self):
+        snapshot = {
+            "seq": self.seq,
+            "accounts": [acc.to_dict() for acc in self.accounts.values()],
+        }
+        tmp_file = self.snapshot_file + ".tmp"
+        with open(tmp_file, "w") as file:
+            json.dump(snapshot, file, separators=(',', ':'))
+            file.flush()
+            os.fsync(file.fileno())
+            self.snapshot_bytes = file.tell()
+        os.replace(tmp_file, self.snapshot_file)
+        # Records up to self.seq are now in the snapshot; start a fresh ledger
+        self.file.close()
+        self.file = open(self.ledger_file, "w", encoding="utf-8")
+        self.pending = 0
+        self.ledger_bytes = 0
+
+    def close(self):
+        with self.lock:
+            if self.file is None:
+                return
+            if self.pending:
+                self._compact()
+            self.file.close()
+            self.file = None
+
+# Step 4: Export statements for many accounts into one directory on a thread pool.
+# Formatting shares the GIL, but file writes and gzip compression run in parallel.
+def export_statements(accounts, directory, filetype='csv', compress=False,
+                      start=None, end=None, workers=EXPORT_WORKERS):
+    os.makedirs(directory, exist_ok=True)
+    ext = filetype + (".gz" if compress else "")
+
+    def export_one(acc):
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(acc.account_number))
+        path = os.path.join(directory, f"statement_{safe_name}.{ext}")
+        return acc.write_statement(path, filetype, start, end, compress)
+
+    began = time.perf_counter()
+    total_rows = total_bytes = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(export_one, acc) for acc in list(accounts.values())]
+        for future in futures:
+            try:
+                rows, size, _ = future.result()
+                total_rows += rows
+                total_bytes += size
+            except Exception as e:
+                failed += 1
+                print(f"Error saving statement: {e}")
+    seconds = time.perf_counter() - began
+    exported = len(futures) - failed
+    print(f"Exported {exported} statement(s) to {directory}: {total_rows} rows, "
+          f"{total_bytes / 1e6:.2f} MB in {seconds:.2f}s "
+          f"({total_rows / max(seconds, 1e-9):,.0f} rows/s, {total_bytes / 1e6 / max(seconds, 1e-9):.1f} MB/s)")
+    return exported, total_rows, total_bytes, seconds
+
+# Step 5: Transfers and batch posting
+# Move money between two accounts atomically; returns an error message or None.
+# Account locks are always taken in id() order, so two opposite transfers
+# running at once cannot deadlock.
+def transfer(source, target, amount):
+    if source is target:
+        return "Cannot transfer to the same account."
+    if not amount > 0:
+        return "Invalid transfer amount."
+    first, second = sorted((source, target), key=id)
+    with first.lock, second.lock, source._ledger_lock():
+        if amount > source.balance:
+            return "Insufficient balance."
+        now = datetime.datetime.now()
+        source._post('Xfer Out', -amount, now)
+        target._post('Xfer In', amount, now)
+        source._log('X', target.account_number, amount, now.timestamp())
+    return None
+
+# Applies batches of postings: (kind, account_number, amount, target_number)
+# where kind is 'deposit', 'withdraw' or 'transfer' (target only for transfers).
+# Postings are split into groups that share no accounts (transfers link their
+# two accounts); each group is applied in order by one worker, and independent
+# groups run on a thread pool. For accounts backed by a ledger, every posting
+# writes its record under the single ledger lock, so those postings are still
+# applied one at a time; the pool only overlaps lookups and validation.
+class TransactionEngine:
+    def __init__(self, accounts, workers=POSTING_WORKERS):
+        self.accounts = accounts
+        self.workers = workers
+
+    def _apply(self, posting):
+        kind, number, amount, target = posting
+        acc = self.accounts.get(number)
+        if acc is None:
+            return f"Account {number} not found."
+        kind = kind.strip().lower()
+        if kind == 'deposit':
+            return acc.post_deposit(amount)
+        if kind in ('withdraw', 'withdrawal'):
+            return acc.post_withdrawal(amount)
+        if kind == 'transfer':
+            target_acc = self.accounts.get(target)
+            if target_acc is None:
+                return f"Account {target} not found."
+            return transfer(acc, target_acc, amount)
+        return f"Unknown posting type: {kind}"
+
+    # Returns one result per posting, in order: None if applied, else the error
+    def post_batch(self, postings):
+        parent = {}
+
+        def find(x):
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for _, number, _, target in postings:
+            root = find(number)
+            if target:
+                other = find(target)
+                if other != root:
+                    parent[other] = root
+
+        groups = defaultdict(list)
+        for i, posting in enumerate(postings):
+            groups[find(posting[1])].append(i)
+
+        results = [None] * len(postings)
+
+        def run_group(indices):
+            for i in indices:
+                results[i] = self._apply(postings[i])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(run_group, groups.values()))
+        return results
+
+    # Post a CSV file with columns: type, account, amount, target (target only for transfers)
+    def ingest_csv(self, filename):
+        began = time.perf_counter()
+        posted = rejected = 0
+        errors = []
+        with open(filename, newline='', encoding='utf-8') as file:
+            reader = csv.DictReader(file)
+            missing = [column for column in INGEST_COLUMNS if column not in (reader.fieldnames or [])]
+            if missing:
+                print(f"Cannot post {filename}: missing column(s) {', '.join(missing)} "
+                      f"(expected header: type,account,amount,target)")
+                return 0, 0
+            line_numbers = []
+            batch = []
+
+            def flush():
+                nonlocal posted, rejected
+                for line, error in zip(line_numbers, self.post_batch(batch)):
+                    if error is None:
+                        posted += 1
+                    else:
+                        rejected += 1
+                        errors.append(f"Line {line}: {error}")
+                batch.clear()
+                line_numbers.clear()
+
+            for row in reader:
+                try:
+                    amount = float(row['amount'])
+                except (TypeError, ValueError):
+                    rejected += 1
+                    errors.append(f"Line {reader.line_num}: Invalid amount.")
+                    continue
+                batch.append((row['type'] or '', row['account'], amount, row.get('target') or None))
+                line_numbers.append(reader.line_num)
+                if len(batch) >= INGEST_BATCH_ROWS:
+                    flush()
+            flush()
+
+        seconds = time.perf_counter() - began
+        for error in errors[:10]:
+            print(error)
+        if len(errors) > 10:
+            print(f"... and {len(errors) - 10} more errors")
+        print(f"Posted {posted} transaction(s), rejected {rejected}, in {seconds:.2f}s "
+              f"({(posted + rejected) / max(seconds, 1e-9):,.0f} rows/s)")
+        return posted, rejected
+
+# Step 6: Create a new account
+def create_new_account(accounts, ledger=None):
     print("\n===== Create New Bank Account =====")
     owner = input("Enter your name: ")
     account_number = input("Enter desired account number: ")
     if account_number in accounts:
         print("Account number already exists.")
     else:
-        accounts[account_number] = BankAccount(owner, account_number)
+        accounts[account_number] = BankAccount(owner, account_number, ledger)
+        if ledger is not None:
+            ledger.append('C', account_number, owner)
         print(f"Account created for {owner} (Account No: {account_number})")
 
-# Step 3: Select an account by account number
+# Step 7: Select an account by account number
 def get_account(accounts):
     acc_num = input("Enter account number: ")
     if acc_num in accounts:
@@ -107,9 +737,25 @@ def get_account(accounts):
         print("Account not found.")
         return None
 
-# Step 4: Main program loop
+# Read a date (YYYY-MM-DD, optionally HH:MM); blank means no limit
+def read_date(prompt, end_of_day=False):
+    text = input(prompt).strip()
+    if not text:
+        return None
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m-%d %H:%M")
+    except ValueError:
+        day = datetime.datetime.strptime(text, "%Y-%m-%d")
+        if end_of_day:
+            return day.replace(hour=23, minute=59, second=59, microsecond=999999)
+        return day
+
+# Step 8: Main program loop
 def main():
-    accounts = {}
+    ledger = Ledger()
+    accounts = ledger.load()
+    if accounts:
+        print(f"Restored {len(accounts)} account(s) from disk.")
 
     while True:
         print("\n===== Intelligent Banking Transaction Simulator =====")
@@ -123,11 +769,18 @@ def main():
         print("8. Edit Account Number")
         print("9. Edit Last Deposit Amount")
         print("10. View Account Profile")
-        print("11. Exit")
-        choice = input("Select an option (1–11): ")
+        print("11. Edit Transaction Amount")
+        print("12. Void Transaction")
+        print("13. Balance on Date")
+        print("14. Transactions Between Dates")
+        print("15. Export All Statements")
+        print("16. Transfer Between Accounts")
+        print("17. Bulk Post from CSV")
+        print("18. Exit")
+        choice = input("Select an option (1–18): ")
 
         if choice == '1':
-            create_new_account(accounts)
+            create_new_account(accounts, ledger)
 
         elif choice == '2':
             acc = get_account(accounts)
@@ -158,9 +811,15 @@ def main():
         elif choice == '6':
             acc = get_account(accounts)
             if acc:
-                fname = input("Enter filename (e.g., statement.txt or statement.csv): ")
-                ftype = 'csv' if fname.endswith('.csv') else 'txt'
-                acc.export_statement(fname, ftype)
+                fname = input("Enter filename (e.g., statement.txt, statement.csv or statement.csv.gz): ")
+                ftype = 'csv' if fname.endswith(('.csv', '.csv.gz')) else 'txt'
+                try:
+                    start = read_date("From date (YYYY-MM-DD, blank for all): ")
+                    end = read_date("To date (YYYY-MM-DD, blank for all): ", end_of_day=True)
+                except ValueError:
+                    print("Invalid date format.")
+                    continue
+                acc.export_statement(fname, ftype, start, end)
 
         elif choice == '7':
             acc = get_account(accounts)
@@ -191,12 +850,77 @@ def main():
                 acc.view_profile()
 
         elif choice == '11':
+            acc = get_account(accounts)
+            if acc:
+                number = int(input("Enter transaction number (see View Transactions): "))
+                new_amount = float(input("Enter new amount: ₹"))
+                acc.edit_transaction(number, new_amount)
+
+        elif choice == '12':
+            acc = get_account(accounts)
+            if acc:
+                number = int(input("Enter transaction number (see View Transactions): "))
+                acc.void_transaction(number)
+
+        elif choice == '13':
+            acc = get_account(accounts)
+            if acc:
+                try:
+                    when = read_date("Enter date (YYYY-MM-DD [HH:MM]): ", end_of_day=True)
+                except ValueError:
+                    print("Invalid date format.")
+                    continue
+                if when is None:
+                    acc.check_balance()
+                else:
+                    print(f"Balance on {when.strftime('%Y-%m-%d %H:%M')}: ₹{acc.balance_at(when):.2f}")
+
+        elif choice == '14':
+            acc = get_account(accounts)
+            if acc:
+                try:
+                    start = read_date("From date (YYYY-MM-DD, blank for all): ")
+                    end = read_date("To date (YYYY-MM-DD, blank for all): ", end_of_day=True)
+                except ValueError:
+                    print("Invalid date format.")
+                    continue
+                print("Date & Time           | Type       | Amount   | Balance")
+                print("----------------------------------------------------------")
+                for date, t_type, amount, bal in acc.transactions_between(start, end):
+                    print(f"{date.strftime('%Y-%m-%d %H:%M:%S')} | {t_type:<10} | ₹{amount:>7.2f} | ₹{bal:>7.2f}")
+
+        elif choice == '15':
+            directory = input("Enter output directory: ").strip() or "statements"
+            ftype = 'csv' if input("Format (csv/txt): ").strip().lower() != 'txt' else 'txt'
+            compress = input("Compress with gzip? (y/n): ").strip().lower() == 'y'
+            export_statements(accounts, directory, ftype, compress)
+
+        elif choice == '16':
+            print("From:")
+            source = get_account(accounts)
+            if source:
+                print("To:")
+                target = get_account(accounts)
+                if target:
+                    amt = float(input("Enter amount to transfer: ₹"))
+                    error = transfer(source, target, amt)
+                    print(error or f"Transferred ₹{amt:.2f} from {source.account_number} to {target.account_number}")
+
+        elif choice == '17':
+            fname = input("Enter CSV file (columns: type,account,amount,target): ").strip()
+            if os.path.exists(fname):
+                TransactionEngine(accounts).ingest_csv(fname)
+            else:
+                print("File not found.")
+
+        elif choice == '18':
+            ledger.close()
             print("Thank you for using the simulator. Goodbye!")
             break
 
         else:
             print("Invalid option. Please try again.")
 
-# Step 5: Run the program
+# Step 9: Run the program
 if __name__ == "__main__":
     main()
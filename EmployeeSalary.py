@@ -1,7 +1,384 @@
 # Employee Salary Analyzer
+import heapq
+import bisect
+import csv
+import os
+import time
+import math
+import mmap
+import struct
+import hashlib
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # only needed for bulk salary hikes
 
 employees = {}
 
+# Column headers of payroll CSV files
+PAYROLL_FIELDS = ["Name", "Salary"]
+ANALYZE_CHUNK_ROWS = 100000  # rows read at a time by analyze_payroll_file
+
+# On-disk payroll store (see PayrollStore)
+PAYROLL_STORE_FILE = "payroll.dat"
+PAYROLL_NAMES_FILE = "payroll.names"
+
+# Running payroll aggregates, updated on every change so the average and the
+# top earner never need a scan over all employees
+class PayrollAggregate:
+    def __init__(self):
+        self.total = 0.0
+        self.count = 0
+        self.heap = []  # max-heap of (-salary, name); outdated entries are skipped lazily
+
+    def add(self, name, salary):
+        self.total += salary
+        self.count += 1
+        heapq.heappush(self.heap, (-salary, name))
+
+    def remove(self, name, salary):
+        self.total -= salary
+        self.count -= 1
+        if self.count == 0:
+            self.total = 0.0  # drop accumulated rounding error
+        # The heap entry goes stale and is discarded when it reaches the top;
+        # rebuild if stale entries pile up
+        if len(self.heap) > 2 * self.count + 64:
+            self.heap = [(-s, n) for n, s in employees.items()]
+            heapq.heapify(self.heap)
+
+    def rebuild(self, data):
+        self.total = sum(data.values())
+        self.count = len(data)
+        self.heap = [(-s, n) for n, s in data.items()]
+        heapq.heapify(self.heap)
+
+    def average(self):
+        return self.total / self.count if self.count else None
+
+    # (name, salary) of the highest-paid employee, or None
+    def top(self):
+        heap = self.heap
+        while heap:
+            neg_salary, name = heap[0]
+            if employees.get(name) == -neg_salary:
+                return name, -neg_salary
+            heapq.heappop(heap)
+        return None
+
+# Salaries kept sorted as (salary, name) with bisect, for threshold, top-k,
+# percentile and rank queries in O(log n) (+ k for the matches returned)
+class SalaryIndex:
+    def __init__(self):
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, name, salary):
+        bisect.insort(self.entries, (salary, name))
+
+    def remove(self, name, salary):
+        pos = bisect.bisect_left(self.entries, (salary, name))
+        assert pos < len(self.entries) and self.entries[pos] == (salary, name), \
+            f"{name!r} earning {salary} is not in the salary index"
+        del self.entries[pos]
+
+    def rebuild(self, data):
+        self.entries = sorted((s, n) for n, s in data.items())
+
+    # (name, salary) of everyone earning more than threshold, highest first
+    def above(self, threshold):
+        entries = self.entries
+        start = bisect.bisect_right(entries, threshold, key=lambda e: e[0])
+        return [(entries[i][1], entries[i][0]) for i in range(len(entries) - 1, start - 1, -1)]
+
+    def top(self, k):
+        entries = self.entries
+        return [(entries[i][1], entries[i][0]) for i in range(len(entries) - 1, max(len(entries) - k, 0) - 1, -1)]
+
+    # Salary at percentile p (0-100), interpolating between neighbours
+    def percentile(self, p):
+        entries = self.entries
+        if not entries:
+            return None
+        pos = (len(entries) - 1) * min(max(p, 0), 100) / 100
+        lower = int(pos)
+        upper = min(lower + 1, len(entries) - 1)
+        return entries[lower][0] + (entries[upper][0] - entries[lower][0]) * (pos - lower)
+
+    def median(self):
+        return self.percentile(50)
+
+    # 1 = highest paid; employees on the same salary share a rank
+    def rank(self, salary):
+        return len(self.entries) - bisect.bisect_right(self.entries, salary, key=lambda e: e[0]) + 1
+
+# Memory-mapped payroll store made of fixed-width 32-byte records:
+#   name hash (u64) | name offset (i64) | name length (u32) | flags (u32) | salary (f64)
+# Names live in a separate append-only heap file. Salary edits and renames
+# rewrite a single record in place; deleted slots are chained into a free
+# list (through the name offset field) and reused by later inserts.
+# Renamed and deleted names are not reclaimed from the heap.
+class PayrollStore:
+    HEADER = struct.Struct('<4sIqqq')  # magic, version, used slots, capacity, free-list head
+    RECORD = struct.Struct('<QqIId')
+    MAGIC = b'PAYR'
+    LIVE = 1
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, filename=PAYROLL_STORE_FILE, names_filename=PAYROLL_NAMES_FILE):
+        if not os.path.exists(filename):
+            with open(filename, "wb") as file:
+                file.write(self.HEADER.pack(self.MAGIC, 1, 0, self.INITIAL_CAPACITY, -1))
+                file.truncate(self.HEADER.size + self.INITIAL_CAPACITY * self.RECORD.size)
+        self.file = open(filename, "r+b")
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+        magic, _, self.used, self.capacity, self.free_head = self.HEADER.unpack_from(self.mm, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{filename} is not a payroll store")
+        self.names = open(names_filename, "a+b")
+        self._by_hash = None
+
+    # name hash -> slots, built from the fixed-width records alone. Built on
+    # the first lookup rather than when the store is opened, so startup only
+    # reads the records once (in load); the first change pays for it instead
+    # (about 1 s per 500k records).
+    @property
+    def by_hash(self):
+        if self._by_hash is None:
+            self._by_hash = {}
+            for slot, (name_hash, _, _, flags, _) in enumerate(self._records()):
+                if flags & self.LIVE:
+                    self._by_hash.setdefault(name_hash, []).append(slot)
+        return self._by_hash
+
+    @staticmethod
+    def _hash(name_bytes):
+        return int.from_bytes(hashlib.blake2b(name_bytes, digest_size=8).digest(), "little")
+
+    def _offset(self, slot):
+        return self.HEADER.size + slot * self.RECORD.size
+
+    def _records(self):
+        end = self._offset(self.used)
+        return self.RECORD.iter_unpack(self.mm[self.HEADER.size:end])
+
+    def _write_header(self):
+        self.HEADER.pack_into(self.mm, 0, self.MAGIC, 1, self.used, self.capacity, self.free_head)
+
+    def _read_name(self, offset, length):
+        self.names.seek(offset)
+        return self.names.read(length)
+
+    def _append_name(self, name_bytes):
+        self.names.seek(0, os.SEEK_END)
+        offset = self.names.tell()
+        self.names.write(name_bytes)
+        self.names.flush()
+        return offset
+
+    def _find(self, name):
+        name_bytes = name.encode("utf-8")
+        for slot in self.by_hash.get(self._hash(name_bytes), ()):
+            _, offset, length, _, _ = self.RECORD.unpack_from(self.mm, self._offset(slot))
+            if self._read_name(offset, length) == name_bytes:
+                return slot
+        return None
+
+    def _allocate(self):
+        if self.free_head >= 0:
+            slot = self.free_head
+            self.free_head = self.RECORD.unpack_from(self.mm, self._offset(slot))[1]
+            return slot
+        if self.used == self.capacity:
+            # Double the file and map it again
+            self.capacity *= 2
+            self.mm.close()
+            self.file.truncate(self._offset(self.capacity))
+            self.mm = mmap.mmap(self.file.fileno(), 0)
+        self.used += 1
+        return self.used - 1
+
+    # {name: salary} of every live record
+    def load(self):
+        self.names.seek(0)
+        heap = self.names.read()
+        return {
+            heap[offset:offset + length].decode("utf-8"): salary
+            for _, offset, length, flags, salary in self._records()
+            if flags & self.LIVE
+        }
+
+    def put(self, name, salary):
+        slot = self._find(name)
+        if slot is not None:
+            struct.pack_into('<d', self.mm, self._offset(slot) + 24, salary)  # salary field only
+            return
+        name_bytes = name.encode("utf-8")
+        name_hash = self._hash(name_bytes)
+        offset = self._append_name(name_bytes)
+        slot = self._allocate()
+        self.RECORD.pack_into(self.mm, self._offset(slot), name_hash, offset, len(name_bytes), self.LIVE, salary)
+        self.by_hash.setdefault(name_hash, []).append(slot)
+        self._write_header()
+
+    def rename(self, old_name, new_name):
+        slot = self._find(old_name)
+        if slot is None:
+            return
+        self.delete(new_name)  # renaming onto an existing name replaces it
+        old_hash, _, _, _, salary = self.RECORD.unpack_from(self.mm, self._offset(slot))
+        name_bytes = new_name.encode("utf-8")
+        name_hash = self._hash(name_bytes)
+        offset = self._append_name(name_bytes)
+        self.RECORD.pack_into(self.mm, self._offset(slot), name_hash, offset, len(name_bytes), self.LIVE, salary)
+        self.by_hash[old_hash].remove(slot)
+        self.by_hash.setdefault(name_hash, []).append(slot)
+
+    def delete(self, name):
+        slot = self._find(name)
+        if slot is None:
+            return
+        name_hash = self.RECORD.unpack_from(self.mm, self._offset(slot))[0]
+        self.RECORD.pack_into(self.mm, self._offset(slot), 0, self.free_head, 0, 0, 0.0)
+        self.free_head = slot
+        self.by_hash[name_hash].remove(slot)
+        self._write_header()
+
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+        self.file.close()
+        self.names.close()
+
+payroll = PayrollAggregate()
+salary_index = SalaryIndex()
+store = None  # PayrollStore opened by main(); None keeps the payroll in memory only
+
+# All changes to `employees` go through these helpers to keep `payroll` and
+# `salary_index` in sync. Salaries must be finite: one NaN would make the
+# running total NaN for good and break the ordering of the sorted index.
+def check_salary(salary):
+    if not math.isfinite(salary):
+        raise ValueError(f"salary must be a finite number, not {salary}")
+
+def set_salary(name, salary):
+    check_salary(salary)
+    if name in employees:
+        payroll.remove(name, employees[name])
+        salary_index.remove(name, employees[name])
+    employees[name] = salary
+    payroll.add(name, salary)
+    salary_index.add(name, salary)
+    if store is not None:
+        store.put(name, salary)
+
+def delete_employee(name):
+    salary = employees.pop(name)
+    payroll.remove(name, salary)
+    salary_index.remove(name, salary)
+    if store is not None:
+        store.delete(name)
+
+def rename_employee(old_name, new_name):
+    if new_name == old_name:
+        return
+    if new_name in employees:
+        delete_employee(new_name)
+    salary = employees.pop(old_name)
+    payroll.remove(old_name, salary)
+    salary_index.remove(old_name, salary)
+    employees[new_name] = salary
+    payroll.add(new_name, salary)
+    salary_index.add(new_name, salary)
+    if store is not None:
+        store.rename(old_name, new_name)
+
+# Replace the whole payroll at once (bulk loads), rebuilding the aggregates in one go
+def load_payroll(data, persist=True):
+    for salary in data.values():
+        check_salary(salary)
+    if store is not None and persist:
+        for name in employees.keys() - data.keys():
+            store.delete(name)
+        for name, salary in data.items():
+            if employees.get(name) != salary:
+                store.put(name, salary)
+    employees.clear()
+    employees.update(data)
+    payroll.rebuild(employees)
+    salary_index.rebuild(employees)
+
+# NumPy-backed payroll table: a whole payroll as a names array and a float64
+# salary array, so hikes apply to everyone (or a filtered subset) in one
+# vectorized operation
+class PayrollTable:
+    def __init__(self, names, salaries):
+        self.names = np.asarray(names, dtype=str)
+        self.salaries = np.asarray(salaries, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.salaries)
+
+    @classmethod
+    def from_csv(cls, filename):
+        names = []
+        salaries = []
+        with open(filename, newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            next(reader, None)  # header
+            for row in reader:
+                if row:
+                    names.append(row[0])
+                    salaries.append(row[1])
+        return cls(names, np.array(salaries, dtype=np.float64))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(list(data), np.fromiter(data.values(), dtype=np.float64, count=len(data)))
+
+    # Boolean mask of rows in a salary band and/or a list of names (None = no filter)
+    def select(self, min_salary=None, max_salary=None, names=None):
+        mask = np.ones(len(self), dtype=bool)
+        if min_salary is not None:
+            mask &= self.salaries >= min_salary
+        if max_salary is not None:
+            mask &= self.salaries <= max_salary
+        if names is not None:
+            mask &= np.isin(self.names, list(names))
+        return mask
+
+    # Percentage hike then flat amount, for the rows in mask (all rows if None);
+    # returns how many salaries changed
+    def apply_hike(self, percent=0.0, flat=0.0, mask=None):
+        factor = 1 + percent / 100
+        if mask is None:
+            self.salaries *= factor
+            self.salaries += flat
+            return len(self)
+        self.salaries[mask] = self.salaries[mask] * factor + flat
+        return int(np.count_nonzero(mask))
+
+    def to_csv(self, filename):
+        tmp_file = filename + ".tmp"
+        with open(tmp_file, "w", newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(PAYROLL_FIELDS)
+            writer.writerows(zip(self.names.tolist(), self.salaries.tolist()))
+        os.replace(tmp_file, filename)
+
+    def to_dict(self):
+        return dict(zip(self.names.tolist(), self.salaries.tolist()))
+
+# A number typed at a prompt; "nan" and "inf" are rejected like any other non-number
+def parse_amount(text):
+    amount = float(text)
+    check_salary(amount)
+    return amount
+
 # Add employee with validation
 def add_employee():
     name = input("Enter employee name: ").strip()
@@ -11,8 +388,8 @@ def add_employee():
 
     salary_input = input("Enter monthly salary: ").strip()
     try:
-        salary = float(salary_input)
-        employees[name] = salary
+        salary = parse_amount(salary_input)
+        set_salary(name, salary)
         print("✅ Employee added successfully!\n")
     except ValueError:
         print("❌ Invalid salary: Please enter a numeric value.\n")
@@ -32,8 +409,7 @@ def calculate_average_salary():
     if not employees:
         print("⚠️ No employee data available.\n")
         return None
-    total = sum(employees.values())
-    average = total / len(employees)
+    average = payroll.average()
     print(f"📊 Average salary: ₹{average:.2f}\n")
     return average
 
@@ -42,7 +418,7 @@ def highest_paid_employee():
     if not employees:
         print("⚠️ No employee data available.\n")
         return
-    highest = max(employees.items(), key=lambda x: x[1])
+    highest = payroll.top()
     print(f"💰 Highest-paid employee: {highest[0]} with ₹{highest[1]:.2f}\n")
 
 # List employees earning above average
@@ -52,15 +428,23 @@ def above_average_employees():
         return
     print("📈 Employees earning above average:")
     found = False
-    for name, salary in employees.items():
-        if salary > average:
-            print(f"- {name}: ₹{salary:.2f}")
-            found = True
+    for name, salary in salary_index.above(average):
+        print(f"- {name}: ₹{salary:.2f}")
+        found = True
     if not found:
         print("No employees earn above the average.\n")
     else:
         print()
 
+# Remove an employee
+def remove_employee():
+    name = input("Enter employee name to remove: ").strip()
+    if name not in employees:
+        print("❌ Employee not found.\n")
+        return
+    delete_employee(name)
+    print("✅ Employee removed successfully!\n")
+
 # Edit employee name
 def edit_employee_name():
     old_name = input("Enter the current employee name: ").strip()
@@ -73,7 +457,7 @@ def edit_employee_name():
         print("❌ Invalid name: Cannot be a number.\n")
         return
 
-    employees[new_name] = employees.pop(old_name)
+    rename_employee(old_name, new_name)
     print("✅ Employee name updated successfully!\n")
 
 # Edit employee salary
@@ -85,8 +469,8 @@ def edit_employee_salary():
 
     salary_input = input("Enter new salary: ").strip()
     try:
-        salary = float(salary_input)
-        employees[name] = salary
+        salary = parse_amount(salary_input)
+        set_salary(name, salary)
         print("✅ Salary updated successfully!\n")
     except ValueError:
         print("❌ Invalid salary: Please enter a numeric value.\n")
@@ -100,16 +484,193 @@ def apply_salary_hike():
 
     hike_input = input("Enter hike percentage (e.g., 10 for 10%): ").strip()
     try:
-        hike_percent = float(hike_input)
+        hike_percent = parse_amount(hike_input)
         current_salary = employees[name]
         new_salary = current_salary + (current_salary * hike_percent / 100)
-        employees[name] = new_salary
+        set_salary(name, new_salary)
         print(f"✅ Salary updated: {name} now earns ₹{new_salary:.2f} after {hike_percent}% hike.\n")
     except ValueError:
         print("❌ Invalid percentage: Please enter a numeric value.\n")
 
+# Salary band report: percentiles, top earners, threshold and rank lookups
+def salary_band_report():
+    if not employees:
+        print("⚠️ No employee data available.\n")
+        return
+    print("\n=== 📐 Salary Bands ===")
+    print(f"Median salary: ₹{salary_index.median():.2f}")
+    for p in (25, 75, 90):
+        print(f"{p}th percentile: ₹{salary_index.percentile(p):.2f}")
+    print("🏆 Top 5 earners:")
+    for name, salary in salary_index.top(5):
+        print(f"- {name}: ₹{salary:.2f}")
+
+    threshold_input = input("Enter a salary to list everyone above it (blank to skip): ").strip()
+    if threshold_input:
+        try:
+            threshold = float(threshold_input)
+            matches = salary_index.above(threshold)
+            print(f"{len(matches)} employee(s) earn above ₹{threshold:.2f}:")
+            for name, salary in matches:
+                print(f"- {name}: ₹{salary:.2f}")
+        except ValueError:
+            print("❌ Invalid salary: Please enter a numeric value.")
+
+    name = input("Enter an employee name to see their rank (blank to skip): ").strip()
+    if name:
+        if name not in employees:
+            print("❌ Employee not found.")
+        else:
+            rank = salary_index.rank(employees[name])
+            print(f"{name} is ranked #{rank} of {len(employees)} by salary.")
+    print()
+
+# Stream (name, salary) rows from a payroll CSV, chunk_rows at a time;
+# rows without a numeric salary are skipped
+def read_payroll_chunks(filename, chunk_rows=ANALYZE_CHUNK_ROWS):
+    with open(filename, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        next(reader, None)  # header
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                return
+            chunk = []
+            for row in rows:
+                try:
+                    chunk.append((row[0], float(row[1])))
+                except (IndexError, ValueError):
+                    continue
+            yield chunk
+
+# Single-pass statistics for payroll files of any size, in bounded memory:
+# count, mean and variance (Welford), min/max and the top_k earners, then a
+# second cheap pass to count above-average earners
+def analyze_payroll_file(filename, top_k=5, chunk_rows=ANALYZE_CHUNK_ROWS):
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    lowest = highest = None
+    top = []  # min-heap of (salary, name), at most top_k entries
+    for chunk in read_payroll_chunks(filename, chunk_rows):
+        for name, salary in chunk:
+            count += 1
+            delta = salary - mean
+            mean += delta / count
+            m2 += delta * (salary - mean)
+            if lowest is None or salary < lowest[1]:
+                lowest = (name, salary)
+            if highest is None or salary > highest[1]:
+                highest = (name, salary)
+            if len(top) < top_k:
+                heapq.heappush(top, (salary, name))
+            elif salary > top[0][0]:
+                heapq.heapreplace(top, (salary, name))
+    if count == 0:
+        return None
+
+    above_average = 0
+    for chunk in read_payroll_chunks(filename, chunk_rows):
+        for _, salary in chunk:
+            if salary > mean:
+                above_average += 1
+
+    variance = m2 / count
+    return {
+        "count": count,
+        "mean": mean,
+        "variance": variance,
+        "std_dev": math.sqrt(variance),
+        "lowest": lowest,
+        "highest": highest,
+        "top": [(name, salary) for salary, name in sorted(top, reverse=True)],
+        "above_average": above_average,
+    }
+
+def analyze_payroll_menu():
+    filename = input("Enter payroll CSV file: ").strip()
+    try:
+        start = time.perf_counter()
+        stats = analyze_payroll_file(filename)
+        elapsed = time.perf_counter() - start
+    except FileNotFoundError:
+        print("❌ File not found.\n")
+        return
+    if stats is None:
+        print("⚠️ No employee data available.\n")
+        return
+    print(f"\n=== 📂 Payroll File Analysis ({stats['count']} employees, {elapsed:.2f}s) ===")
+    print(f"📊 Average salary: ₹{stats['mean']:.2f} (std dev ₹{stats['std_dev']:.2f})")
+    print(f"💰 Highest-paid employee: {stats['highest'][0]} with ₹{stats['highest'][1]:.2f}")
+    print(f"🔻 Lowest-paid employee: {stats['lowest'][0]} with ₹{stats['lowest'][1]:.2f}")
+    print(f"📈 Employees earning above average: {stats['above_average']}")
+    print("🏆 Top earners:")
+    for name, salary in stats["top"]:
+        print(f"- {name}: ₹{salary:.2f}")
+    print()
+
+# Bulk salary hike over a payroll CSV file or the current employees
+def bulk_salary_hike():
+    if np is None:
+        print("❌ Bulk mode needs NumPy (pip install numpy).\n")
+        return
+
+    filename = input("Enter payroll CSV file (blank for current employees): ").strip()
+    try:
+        if filename:
+            table = PayrollTable.from_csv(filename)
+        elif employees:
+            table = PayrollTable.from_dict(employees)
+        else:
+            print("⚠️ No employee data available.\n")
+            return
+    except FileNotFoundError:
+        print("❌ File not found.\n")
+        return
+    except (ValueError, IndexError):
+        print("❌ Invalid payroll file: expected Name,Salary rows.\n")
+        return
+
+    try:
+        percent = parse_amount(input("Enter hike percentage (blank for 0): ").strip() or "0")
+        flat = parse_amount(input("Enter flat hike amount (blank for 0): ").strip() or "0")
+        min_input = input("Only salaries from (blank for no minimum): ").strip()
+        max_input = input("Only salaries up to (blank for no maximum): ").strip()
+        min_salary = parse_amount(min_input) if min_input else None
+        max_salary = parse_amount(max_input) if max_input else None
+    except ValueError:
+        print("❌ Invalid value: Please enter a numeric value.\n")
+        return
+    names_input = input("Only these employees, comma-separated (blank for everyone): ").strip()
+    names = [n.strip() for n in names_input.split(",") if n.strip()] if names_input else None
+
+    start = time.perf_counter()
+    if min_salary is None and max_salary is None and names is None:
+        changed = table.apply_hike(percent, flat)
+    else:
+        changed = table.apply_hike(percent, flat, table.select(min_salary, max_salary, names))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if not np.isfinite(table.salaries).all():
+        print("❌ Not saved: some salaries are not finite numbers.\n")
+        return
+
+    if filename:
+        table.to_csv(filename)
+    else:
+        load_payroll(table.to_dict())
+    print(f"✅ Hike applied to {changed} of {len(table)} employees in {elapsed_ms:.1f} ms.\n")
+
 # Main menu
+# Startup is not instant for large payrolls: every record is read into
+# `employees`, then the total, the top-earner heap and the sorted salary index
+# are built from them: 1.5-1.9 s for 500k employees.
 def main():
+    global store
+    store = PayrollStore()
+    load_payroll(store.load(), persist=False)
+    if employees:
+        print(f"📂 Loaded {len(employees)} employee(s) from {PAYROLL_STORE_FILE}.\n")
+
     while True:
         print("=== 🧮 Employee Salary Analyzer ===")
         print("1. Add Employee")
@@ -120,7 +681,11 @@ def main():
         print("6. Edit Employee Name")
         print("7. Edit Employee Salary")
         print("8. Apply Salary Hike")
-        print("9. Exit")
+        print("9. Salary Band Report")
+        print("10. Bulk Salary Hike")
+        print("11. Analyze Payroll File")
+        print("12. Remove Employee")
+        print("13. Exit")
 
         choice = input("Enter your choice: ")
 
@@ -141,6 +706,15 @@ def main():
         elif choice == '8':
             apply_salary_hike()
         elif choice == '9':
+            salary_band_report()
+        elif choice == '10':
+            bulk_salary_hike()
+        elif choice == '11':
+            analyze_payroll_menu()
+        elif choice == '12':
+            remove_employee()
+        elif choice == '13':
+            store.close()
             print("👋 Exiting the program. Goodbye!")
             break
         else:
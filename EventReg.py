@@ -1,21 +1,131 @@
 # Step 1: Import necessary libraries
 import streamlit as st
 import pandas as pd
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import os
-import uuid
-from datetime import datetime
-
-# Step 2: Configure Streamlit page
+import io
+import csv
+import math
+import threading
+from collections import Counter
+from EventRegCore import (
+    STORAGE_BACKEND, REGISTRATIONS_FILE, DATABASE_FILE, EMAIL_QUEUE_FILE, PAGE_SIZES,
+    COLUMNS, TICKET_TYPES, RegistrationRejected, EmailDispatcher, RegistrationWriter,
+    load_email_config, open_registration_db, register, send_confirmation,
+)
+
+# Step 2: Registration storage, shared by all sessions (see EventRegCore.py)
+# CSV backend: cached registration summary
+# Shared by all sessions and reruns. It is keyed on the file's size and mtime:
+# when the file has only grown, just the appended tail is read and parsed;
+# if it shrank or was rewritten, it is reloaded once. Only whole CSV records
+# are consumed: a write still in progress (possibly in the middle of a quoted
+# comment spanning several lines) is left for the next refresh.
+class RegistrationSummary:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.size = 0
+        self.mtime = None
+        self.columns = None
+        self.rows = []
+        self.ticket_counts = Counter()
+        self.csv_cache = (0, b"")  # (size, bytes) of the last download
+
+    def refresh(self):
+        with self.lock:
+            if not os.path.exists(self.path):
+                self._reset()
+                return
+            stat = os.stat(self.path)
+            if (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime):
+                return
+            if stat.st_size < self.size or stat.st_size == self.size:
+                self._reset()  # truncated or rewritten in place
+            with open(self.path, "rb") as file:
+                file.seek(self.size)
+                tail = file.read(stat.st_size - self.size)
+            # Whole lines only (this also keeps UTF-8 characters whole), then
+            # whole records: a row the reader finishes only because the lines
+            # ran out is cut off inside a quoted field, so it is left unread
+            text = tail[:tail.rfind(b"\n") + 1].decode("utf-8")
+            consumed = 0
+            lines_read = 0
+            ran_out = False
+
+            def lines():
+                nonlocal lines_read, ran_out
+                for line in io.StringIO(text, newline=""):
+                    lines_read += len(line)
+                    yield line
+                ran_out = True
+
+            new_rows = []
+            for row in csv.reader(lines()):
+                if ran_out:
+                    break
+                consumed = lines_read
+                if self.columns is None:
+                    self.columns = row
+                elif row:
+                    new_rows.append(row)
+            ticket_column = self.columns.index("Ticket Type") if self.columns and "Ticket Type" in self.columns else None
+            if ticket_column is not None:
+                self.ticket_counts.update(row[ticket_column] for row in new_rows if len(row) > ticket_column)
+            self.rows.extend(new_rows)
+            self.size += len(text[:consumed].encode("utf-8"))
+            self.mtime = stat.st_mtime_ns
+
+    # The CSV parsed so far for the download button, read again only when
+    # more of the file has been parsed
+    def csv_bytes(self):
+        with self.lock:
+            if self.csv_cache[0] != self.size:
+                with open(self.path, "rb") as file:
+                    self.csv_cache = (self.size, file.read(self.size))
+            return self.csv_cache[1]
+
+    def count(self):
+        return len(self.rows)
+
+    def page(self, number, page_size):
+        start = (number - 1) * page_size
+        return pd.DataFrame(self.rows[start:start + page_size], columns=self.columns)
+
+@st.cache_resource
+def get_registration_summary(path):
+    return RegistrationSummary(path)
+
+@st.cache_resource
+def get_email_dispatcher():
+    return EmailDispatcher(EMAIL_QUEUE_FILE, load_email_config())
+
+@st.cache_resource
+def get_registration_db(path):
+    return open_registration_db(path, REGISTRATIONS_FILE)
+
+# CSV export of the database, built only when the download button is clicked
+def registrations_csv(db):
+    buffer = io.BytesIO()
+    with io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True) as file:
+        db.export_csv(file)
+        return buffer.getvalue()
+
+@st.cache_resource
+def get_registration_writer(backend):
+    db = get_registration_db(DATABASE_FILE) if backend == "sqlite" else None
+    return RegistrationWriter(backend, db)
+
+# Step 3: Configure Streamlit page
 st.set_page_config(page_title="Event Registration", layout="centered")
 
-# Step 3: Set up the app header
+# Step 4: Set up the app header
 st.title("🎟️ Event Registration System")
 st.write("Please fill out the form below to register for the event.")
 
-# Step 4: Create a form for user input
+# Step 5: Create a form for user input
 with st.form("registration_form"):
     col1, col2 = st.columns(2)
     with col1:
@@ -25,41 +135,27 @@ with st.form("registration_form"):
 
     ticket_type = st.selectbox(
         "Select Ticket Type",
-        ["General Admission", "VIP", "Student Pass", "Group Booking"]
+        TICKET_TYPES
     )
 
     comments = st.text_area("Any special requests or comments?")
     send_email = st.checkbox("Send me a confirmation email")
     submitted = st.form_submit_button("Register")
 
-# Step 5: Helper function to validate email format
-def is_valid_email(email):
-    return "@" in email and "." in email
-
 # Step 6: Handle form submission
 if submitted:
-    if not name or not email:
-        st.error("❌ Please fill in all required fields: Name and Email.")
-    elif not is_valid_email(email):
-        st.error("❌ Please enter a valid email address.")
-    else:
-        registration_id = str(uuid.uuid4())[:8]
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        registration = {
-            "Registration ID": registration_id,
-            "Name": name,
-            "Email": email,
-            "Ticket Type": ticket_type,
-            "Comments": comments,
-            "Timestamp": timestamp
-        }
-
-        file_exists = os.path.isfile("registrations.csv")
-        df = pd.DataFrame([registration])
-        df.to_csv("registrations.csv", mode='a', header=not file_exists, index=False)
+    registration = None
+    try:
+        registration = register(get_registration_writer(STORAGE_BACKEND), name, email, ticket_type, comments)
+    except RegistrationRejected as e:
+        st.error(f"❌ {e}")
+
+    if registration:
+        registration_id = registration["Registration ID"]
 
         st.success("✅ Registration Successful!")
+        if registration["Duplicate"]:
+            st.warning(f"⚠️ {email} was already registered; this registration has been flagged.")
         st.write(f"🆔 Registration ID: `{registration_id}`")
         st.write(f"🎫 Ticket Type: {ticket_type}")
         if comments:
@@ -67,66 +163,57 @@ if submitted:
         if send_email:
             st.write(f"📧 Confirmation will be sent to: {email}")
 
-        # Optional email confirmation
+        # Optional email confirmation, sent in the background
         if send_email:
             try:
-                sender_email = "youremail@example.com"
-                sender_password = "yourpassword"
-                smtp_server = "smtp.example.com"
-                smtp_port = 587
-
-                msg = MIMEMultipart()
-                msg["From"] = sender_email
-                msg["To"] = email
-                msg["Subject"] = "Event Registration Confirmation"
-
-                body = f"""
-                Hi {name},
-
-                Thank you for registering for our event!
-                Registration ID: {registration_id}
-                Ticket Type: {ticket_type}
-                Comments: {comments if comments else 'None'}
-                Timestamp: {timestamp}
-
-                We look forward to seeing you!
-
-                Best regards,
-                Event Team
-                """
-                msg.attach(MIMEText(body, "plain"))
-
-                server = smtplib.SMTP(smtp_server, smtp_port)
-                server.starttls()
-                server.login(sender_email, sender_password)
-                server.sendmail(sender_email, email, msg.as_string())
-                server.quit()
-
-                st.info("📨 Confirmation email sent successfully.")
+                send_confirmation(get_email_dispatcher(), registration)
+                st.info("📨 Confirmation email queued; it will arrive shortly.")
             except Exception as e:
-                st.warning(f"⚠️ Failed to send email: {e}")
+                st.warning(f"⚠️ Failed to queue email: {e}")
 
-# Step 7: Display live registration count and full table
+# Step 7: Display live registration count and a paginated table
 st.subheader("📊 Live Registration Summary")
 
-if os.path.exists("registrations.csv"):
+total_count = 0
+if STORAGE_BACKEND == "sqlite":
+    db = get_registration_db(DATABASE_FILE)
+    total_count = db.count()
+    ticket_counts = db.ticket_counts()
+    get_page = lambda number, size: pd.DataFrame(db.page(number, size), columns=COLUMNS)
+    get_csv = lambda: registrations_csv(db)
+else:
+    summary = get_registration_summary(REGISTRATIONS_FILE)
     try:
-        reg_df = pd.read_csv("registrations.csv")
-        total_count = len(reg_df)
-        st.info(f"✅ Total Registrations: {total_count}")
-
-        # Show full registration table
-        st.dataframe(reg_df)
-
-        # Download button
-        csv = reg_df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="⬇️ Download Registration Data as CSV",
-            data=csv,
-            file_name="registrations.csv",
-            mime="text/csv"
-        )
-    except pd.errors.ParserError as e:
+        summary.refresh()
+        total_count = summary.count()
+        ticket_counts = summary.ticket_counts
+        get_page = summary.page
+        get_csv = summary.csv_bytes
+    except (csv.Error, UnicodeDecodeError) as e:
         st.warning(f"⚠️ Could not read registration data: {e}")
+
+if total_count:
+    st.info(f"✅ Total Registrations: {total_count}")
+    if ticket_counts:  # empty if the CSV has no "Ticket Type" column
+        cols = st.columns(len(ticket_counts))
+        for col, (ticket, count) in zip(cols, sorted(ticket_counts.items())):
+            col.metric(ticket, count)
+
+    # Show one page of the registration table
+    col_size, col_page = st.columns(2)
+    with col_size:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+    pages = max(1, math.ceil(total_count / page_size))
+    with col_page:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1)
+    st.dataframe(get_page(page, page_size))
+
+    # Download button; the file is only produced when it is clicked
+    st.download_button(
+        label="⬇️ Download Registration Data as CSV",
+        data=get_csv,
+        file_name="registrations.csv",
+        mime="text/csv"
+    )
 else:
     st.info("📊 Total Registrations: 0")
@@ -0,0 +1,206 @@
+# EventReg load test: drives the registration path from EventRegCore.py
+# headless (no browser) with N concurrent simulated users and reports
+# latency percentiles and throughput for each storage backend. Confirmation
+# emails go to a local SMTP sink instead of a real mail server.
+#
+#   python EventRegBench.py --users 50 --per-user 200 --backend sqlite csv
+
+# Step 1: Import necessary libraries
+import argparse
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from EventRegCore import (
+    EMAIL_DEFAULTS, EMAIL_QUEUE_FILE, TICKET_TYPES, EmailDispatcher,
+    RegistrationRejected, RegistrationWriter, is_valid_email, register, send_confirmation,
+)
+
+# Step 2: Local SMTP sink
+# Speaks just enough SMTP for smtplib (no TLS, no auth) and counts what it receives
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.server.record(connections=1)
+        self.reply("220 localhost SMTP sink")
+        in_data = False
+        for line in self.rfile:
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    in_data = False
+                    self.server.record(messages=1)
+                    self.reply("250 OK: queued")
+                continue
+            command = line[:4].upper()
+            if command in (b"HELO", b"EHLO"):
+                self.reply("250 localhost")
+            elif command == b"DATA":
+                in_data = True
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:  # MAIL, RCPT, RSET, NOOP
+                self.reply("250 OK")
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPSinkHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        threading.Thread(target=self.serve_forever, name="smtp-sink", daemon=True).start()
+
+    def record(self, connections=0, messages=0):
+        with self.lock:
+            self.connections += connections
+            self.messages += messages
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+# Step 3: Simulated users
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, round(pct / 100 * (len(values) - 1)))]
+
+# Each user submits `count` registrations back to back, like a form post,
+# recording how long each one took from submit to confirmation queued
+def simulate_user(user, count, writer, dispatcher, start, latencies, errors):
+    start.wait()
+    for i in range(count):
+        began = time.perf_counter()
+        try:
+            registration = register(writer, f"User {user}", f"user{user}.{i}@bench.example.com",
+                                    TICKET_TYPES[i % len(TICKET_TYPES)], "load test")
+            if dispatcher is not None:
+                send_confirmation(dispatcher, registration)
+        except RegistrationRejected:
+            errors.append(user)
+            continue
+        latencies.append(time.perf_counter() - began)
+
+def run_benchmark(backend, users, per_user, sink=None, email_timeout=60):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f"eventreg-{backend}-") as workdir:
+        # The core uses relative file names, so each run gets a fresh directory
+        os.chdir(workdir)
+        try:
+            writer = RegistrationWriter(backend)
+            dispatcher = None
+            if sink is not None:
+                config = dict(EMAIL_DEFAULTS, smtp_server="127.0.0.1", smtp_port=sink.port,
+                              use_tls=False, sender_email="events@bench.example.com")
+                dispatcher = EmailDispatcher(EMAIL_QUEUE_FILE, config)
+            sent_before = sink.messages if sink is not None else 0
+
+            start = threading.Event()
+            latencies, errors = [], []
+            threads = [
+                threading.Thread(target=simulate_user,
+                                 args=(user, per_user, writer, dispatcher, start, latencies, errors))
+                for user in range(users)
+            ]
+            for thread in threads:
+                thread.start()
+            began = time.perf_counter()
+            start.set()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - began
+
+            result = {
+                "backend": backend,
+                "registrations": len(latencies),
+                "rejected": len(errors),
+                "seconds": elapsed,
+                "throughput": len(latencies) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+            }
+            if dispatcher is not None:
+                # How long the background worker needs to deliver everything queued
+                deadline = time.monotonic() + email_timeout
+                while dispatcher.pending() and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                result["emails_sent"] = sink.messages - sent_before
+                result["email_seconds"] = time.perf_counter() - began
+                dispatcher.stop()
+            return result
+        finally:
+            os.chdir(cwd)
+
+# Delivery check against the sink: a message smtplib cannot send (a
+# non-ASCII address queued before validation rejected them) is marked failed
+# and the dispatcher goes on to deliver the messages behind it
+def check_email_delivery(sink, timeout=10):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="eventreg-email-") as workdir:
+        os.chdir(workdir)
+        try:
+            config = dict(EMAIL_DEFAULTS, smtp_server="127.0.0.1", smtp_port=sink.port,
+                          use_tls=False, sender_email="events@bench.example.com")
+            dispatcher = EmailDispatcher(EMAIL_QUEUE_FILE, config)
+            sent_before = sink.messages
+            dispatcher.enqueue("jos\u00e9@example.com", "Check", "Cannot be sent")
+            dispatcher.enqueue("bob@example.com", "Check", "Must be sent")
+            deadline = time.monotonic() + timeout
+            while dispatcher.pending() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            alive = dispatcher.thread.is_alive()
+            with dispatcher.lock:
+                statuses = dict(dispatcher.conn.execute("SELECT recipient, status FROM outbox"))
+            dispatcher.stop()
+            assert alive, "the dispatcher thread died"
+            assert statuses == {"jos\u00e9@example.com": "failed", "bob@example.com": "sent"}, statuses
+            assert sink.messages - sent_before == 1, sink.messages - sent_before
+            assert not is_valid_email("jos\u00e9@example.com")
+        finally:
+            os.chdir(cwd)
+
+# Step 4: Command line
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the EventReg registration path.")
+    parser.add_argument("--users", type=int, default=50, help="concurrent simulated users (default 50)")
+    parser.add_argument("--per-user", type=int, default=100, help="registrations per user (default 100)")
+    parser.add_argument("--backend", nargs="+", choices=["sqlite", "csv"], default=["sqlite", "csv"],
+                        help="storage backends to test (default both)")
+    parser.add_argument("--no-email", action="store_true", help="skip confirmation emails")
+    parser.add_argument("--check-email", action="store_true",
+                        help="only check that undeliverable messages do not stop the email queue")
+    args = parser.parse_args()
+
+    if args.check_email:
+        sink = SMTPSink()
+        check_email_delivery(sink)
+        sink.shutdown()
+        print("✅ Undeliverable message marked failed; the next one was delivered")
+        return
+
+    sink = None if args.no_email else SMTPSink()
+    print(f"🚀 {args.users} users x {args.per_user} registrations per backend")
+    for backend in args.backend:
+        result = run_benchmark(backend, args.users, args.per_user, sink)
+        print(f"\n📊 {backend}")
+        print(f"   Registrations: {result['registrations']} ({result['rejected']} rejected) "
+              f"in {result['seconds']:.2f}s")
+        print(f"   Throughput:    {result['throughput']:.0f} registrations/s")
+        print(f"   Latency:       p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+        if "emails_sent" in result:
+            print(f"   Emails:        {result['emails_sent']} delivered to the sink "
+                  f"after {result['email_seconds']:.2f}s")
+    if sink is not None:
+        print(f"\n📨 SMTP sink: {sink.messages} messages over {sink.connections} connection(s)")
+        sink.shutdown()
+
+if __name__ == "__main__":
+    main()
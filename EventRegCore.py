@@ -0,0 +1,582 @@
+# EventReg core: registration logic without the Streamlit UI
+# Validation, registration IDs, storage, duplicate/capacity checks and the
+# confirmation email queue. EventReg.py is the web front end; EventRegBench.py
+# drives the same code headless to load-test it.
+
+# Step 1: Import necessary libraries
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+import os
+import csv
+import contextlib
+import pathlib
+import json
+import math
+import time
+import sqlite3
+import struct
+import hashlib
+import mmap
+import threading
+import queue
+from collections import Counter
+from concurrent.futures import Future
+from datetime import datetime
+
+# Storage backend: "sqlite" (default) or "csv"
+STORAGE_BACKEND = os.environ.get("EVENTREG_BACKEND", "sqlite")
+REGISTRATIONS_FILE = "registrations.csv"
+DATABASE_FILE = "registrations.db"
+PAGE_SIZES = [25, 50, 100, 500]
+GROUP_COMMIT_INTERVAL = 0.005  # seconds the writer waits to gather more submissions
+GROUP_COMMIT_MAX = 500         # most registrations written in one group commit
+COLUMNS = ["Registration ID", "Name", "Email", "Ticket Type", "Comments", "Timestamp"]
+
+# Ticket types and per-type capacity (None = unlimited)
+TICKET_TYPES = ["General Admission", "VIP", "Student Pass", "Group Booking"]
+TICKET_CAPACITY = {
+    "General Admission": None,
+    "VIP": None,
+    "Student Pass": None,
+    "Group Booking": None,
+}
+# Repeat registrations from the same email: "reject" them or "flag" and accept
+DUPLICATE_POLICY = "reject"
+# For very large events, track emails in a persisted Bloom filter instead of a set
+USE_BLOOM_FILTER = os.environ.get("EVENTREG_BLOOM_FILTER") == "1"
+BLOOM_FILE = "registrations.bloom"
+BLOOM_CAPACITY = 1_000_000
+BLOOM_ERROR_RATE = 0.001
+
+# Outgoing confirmation emails: SMTP settings are read from EMAIL_CONFIG_FILE
+# (keys as in EMAIL_DEFAULTS); messages wait in EMAIL_QUEUE_FILE until sent
+EMAIL_CONFIG_FILE = "email_config.json"
+EMAIL_QUEUE_FILE = "email_queue.db"
+EMAIL_DEFAULTS = {
+    "smtp_server": "smtp.example.com",
+    "smtp_port": 587,
+    "use_tls": True,
+    "sender_email": "youremail@example.com",
+    "sender_password": "",
+    "batch_size": 50,         # messages sent per pass over the queue
+    "max_attempts": 5,        # give up on a message after this many failures
+    "retry_delay": 5,         # seconds before the first retry; doubles each time
+    "idle_timeout": 60,       # close the SMTP connection after this long without mail
+}
+
+# Step 2: Registration storage
+# SQLite backend in WAL mode, with email, ticket type and timestamp indexed
+# for lookups, counts and paging. Writes go through one connection behind
+# self.lock; reads (lookups, counts, pages, exports) take a read-only
+# connection from a pool, so under WAL a long export never blocks the writer.
+class RegistrationDB:
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.read_uri = pathlib.Path(path).absolute().as_uri() + "?mode=ro"
+        self.readers = queue.SimpleQueue()  # idle read-only connections
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS registrations (
+                    id INTEGER PRIMARY KEY,
+                    registration_id TEXT NOT NULL UNIQUE,
+                    name TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    ticket_type TEXT NOT NULL,
+                    comments TEXT,
+                    timestamp TEXT NOT NULL
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_registrations_email ON registrations(email)")
+            # Duplicate checks match emails the way normalize_email does
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_registrations_email_key "
+                              "ON registrations(lower(trim(email)))")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_registrations_ticket ON registrations(ticket_type)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_registrations_time ON registrations(timestamp)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def add_many(self, registrations):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO registrations (registration_id, name, email, ticket_type, comments, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [[r[column] for column in COLUMNS] for r in registrations],
+            )
+
+    def add(self, registration):
+        self.add_many([registration])
+
+    # A read-only connection for the duration of a with block
+    @contextlib.contextmanager
+    def reading(self):
+        try:
+            conn = self.readers.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.read_uri, uri=True, check_same_thread=False)
+        try:
+            yield conn
+        finally:
+            self.readers.put(conn)
+
+    def emails(self):
+        with self.reading() as conn:
+            return [row[0] for row in conn.execute("SELECT email FROM registrations")]
+
+    # Whether a registration exists for an email already normalized by normalize_email
+    def has_email(self, email):
+        with self.reading() as conn:
+            return conn.execute(
+                "SELECT 1 FROM registrations WHERE lower(trim(email)) = ? LIMIT 1", (email,)
+            ).fetchone() is not None
+
+    # Highest sequence number used by a generated "R<number>" registration ID
+    def max_sequence(self):
+        with self.reading() as conn:
+            return conn.execute(
+                "SELECT COALESCE(MAX(CAST(SUBSTR(registration_id, 2) AS INTEGER)), 0) "
+                "FROM registrations WHERE registration_id GLOB 'R[0-9]*'"
+            ).fetchone()[0]
+
+    def count(self):
+        with self.reading() as conn:
+            return conn.execute("SELECT COUNT(*) FROM registrations").fetchone()[0]
+
+    def ticket_counts(self):
+        with self.reading() as conn:
+            return dict(conn.execute(
+                "SELECT ticket_type, COUNT(*) FROM registrations GROUP BY ticket_type"
+            ).fetchall())
+
+    def _select(self):
+        return ("SELECT registration_id, name, email, ticket_type, comments, timestamp "
+                "FROM registrations ORDER BY id")
+
+    # One page of registrations as rows in COLUMNS order
+    def page(self, number, page_size):
+        with self.reading() as conn:
+            return conn.execute(self._select() + " LIMIT ? OFFSET ?",
+                                (page_size, (number - 1) * page_size)).fetchall()
+
+    # Stream every registration to a text file object as CSV, straight from the cursor
+    def export_csv(self, file):
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        with self.reading() as conn:
+            cursor = conn.execute(self._select())
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                writer.writerows(rows)
+
+    # One-time import of an existing registrations.csv
+    def migrate_csv(self, csv_path):
+        with self.lock:
+            done = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_csv'").fetchone()
+        if done or not os.path.exists(csv_path):
+            return 0
+        with open(csv_path, newline="", encoding="utf-8") as file:
+            registrations = [
+                {column: row.get(column) or "" for column in COLUMNS}
+                for row in csv.DictReader(file)
+            ]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO registrations (registration_id, name, email, ticket_type, comments, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [[r[column] for column in COLUMNS] for r in registrations],
+            )
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_csv', ?)", (csv_path,))
+        return len(registrations)
+
+# Outbound email queue drained by one background worker. Messages are
+# stored in SQLite so they survive restarts; the worker keeps one
+# authenticated SMTP connection open while there is mail to send and
+# retries failures with exponential backoff.
+def load_email_config(path=EMAIL_CONFIG_FILE):
+    config = dict(EMAIL_DEFAULTS)
+    if os.path.exists(path):
+        with open(path, "r") as file:
+            config.update(json.load(file))
+    return config
+
+class EmailDispatcher:
+    def __init__(self, queue_path, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(queue_path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY,
+                    recipient TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL DEFAULT 0,
+                    last_error TEXT
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt)")
+        self.server = None
+        self.last_sent = 0.0
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self.thread.start()
+
+    def enqueue(self, recipient, subject, body):
+        msg = MIMEMultipart()
+        msg["From"] = self.config["sender_email"]
+        msg["To"] = recipient
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "plain"))
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO outbox (recipient, message) VALUES (?, ?)",
+                              (recipient, msg.as_string()))
+        self.wake.set()
+
+    def pending(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def stop(self):
+        self.stopping.set()
+        self.wake.set()
+        self.thread.join()
+
+    def _run(self):
+        while not self.stopping.is_set():
+            with self.lock:
+                batch = self.conn.execute(
+                    "SELECT id, recipient, message, attempts FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+                    (time.time(), self.config["batch_size"]),
+                ).fetchall()
+            if not batch:
+                self._close_if_idle()
+                self.wake.wait(timeout=self._seconds_until_due())
+                self.wake.clear()
+                continue
+            for message_id, recipient, message, attempts in batch:
+                try:
+                    self._send(recipient, message)
+                    self._mark(message_id, "sent", attempts + 1, None)
+                except (smtplib.SMTPException, OSError) as e:
+                    self._disconnect()
+                    attempts += 1
+                    status = "failed" if attempts >= self.config["max_attempts"] else "pending"
+                    self._mark(message_id, status, attempts, str(e),
+                               time.time() + self.config["retry_delay"] * 2 ** (attempts - 1))
+                except Exception as e:
+                    # Not a delivery problem (e.g. an address smtplib cannot encode):
+                    # retrying cannot help, and the worker must keep draining the queue
+                    self._disconnect()
+                    self._mark(message_id, "failed", attempts + 1, repr(e))
+        self._disconnect()
+
+    def _mark(self, message_id, status, attempts, error, next_attempt=0):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt = ? WHERE id = ?",
+                (status, attempts, error, next_attempt, message_id),
+            )
+
+    def _seconds_until_due(self):
+        with self.lock:
+            due = self.conn.execute(
+                "SELECT MIN(next_attempt) FROM outbox WHERE status = 'pending'"
+            ).fetchone()[0]
+        wait = self.config["idle_timeout"] if due is None else due - time.time()
+        return min(max(wait, 0.01), self.config["idle_timeout"])
+
+    def _connect(self):
+        config = self.config
+        server = smtplib.SMTP(config["smtp_server"], config["smtp_port"], timeout=30)
+        if config["use_tls"]:
+            server.starttls()
+        if config["sender_password"]:
+            server.login(config["sender_email"], config["sender_password"])
+        self.server = server
+
+    def _send(self, recipient, message):
+        if self.server is None:
+            self._connect()
+        try:
+            self.server.sendmail(self.config["sender_email"], recipient, message)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped the idle connection; reconnect once
+            self._connect()
+            self.server.sendmail(self.config["sender_email"], recipient, message)
+        self.last_sent = time.time()
+
+    def _close_if_idle(self):
+        if self.server is not None and time.time() - self.last_sent >= self.config["idle_timeout"]:
+            self._disconnect()
+
+    def _disconnect(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
+def open_registration_db(path=DATABASE_FILE, csv_path=REGISTRATIONS_FILE):
+    db = RegistrationDB(path)
+    db.migrate_csv(csv_path)
+    return db
+
+# Append registrations to the CSV file in a single write
+def append_registrations_csv(path, registrations):
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        if write_header:
+            writer.writerow(COLUMNS)
+        writer.writerows([[r[column] for column in COLUMNS] for r in registrations])
+
+def csv_max_sequence(path):
+    highest = 0
+    if os.path.exists(path):
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                reg_id = row.get("Registration ID") or ""
+                if reg_id[:1] == "R" and reg_id[1:].isdigit():
+                    highest = max(highest, int(reg_id[1:]))
+    return highest
+
+class RegistrationRejected(ValueError):
+    pass
+
+def normalize_email(email):
+    return email.strip().lower()
+
+# Bloom filter whose bit array is a memory-mapped file, so it persists as
+# bits are set and does not need rebuilding at startup
+class BloomFilter:
+    HEADER = struct.Struct("<4sQI")  # magic, number of bits, number of hashes
+    MAGIC = b"BLM1"
+
+    def __init__(self, path, capacity, error_rate):
+        if not os.path.exists(path):
+            bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+            hashes = max(1, round(bits / capacity * math.log(2)))
+            with open(path, "wb") as file:
+                file.write(self.HEADER.pack(self.MAGIC, bits, hashes))
+                file.truncate(self.HEADER.size + (bits + 7) // 8)
+        self.file = open(path, "r+b")
+        self.bits = mmap.mmap(self.file.fileno(), 0)
+        magic, self.size, self.hashes = self.HEADER.unpack_from(self.bits, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} is not a Bloom filter file")
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        offset = self.HEADER.size
+        for pos in self._positions(item):
+            self.bits[offset + pos // 8] |= 1 << (pos % 8)
+
+    def __contains__(self, item):
+        offset = self.HEADER.size
+        return all(self.bits[offset + pos // 8] & (1 << (pos % 8)) for pos in self._positions(item))
+
+# Duplicate and capacity checks in O(1): emails already registered (a set, or
+# a Bloom filter confirmed against the database) and a counter per ticket
+# type, built once at startup and updated by the writer on every registration
+class RegistrationIndex:
+    def __init__(self, emails, ticket_counts, bloom=None, confirm=None):
+        self.bloom = bloom
+        self.confirm = confirm  # exact lookup for Bloom hits; None treats hits as duplicates
+        self.emails = set() if bloom is None else None
+        self.uncommitted = set()  # admitted emails the database cannot confirm yet
+        self.ticket_counts = Counter(ticket_counts)
+        for email in emails:
+            self._add_email(normalize_email(email))
+
+    def _add_email(self, email):
+        if self.bloom is None:
+            self.emails.add(email)
+        else:
+            self.bloom.add(email)
+
+    def is_registered(self, email):
+        if self.bloom is None:
+            return email in self.emails
+        if email in self.uncommitted:
+            return True
+        if email not in self.bloom:
+            return False
+        return self.confirm(email) if self.confirm else True
+
+    # Check a registration and count it; returns True if it is a flagged duplicate
+    def admit(self, registration):
+        ticket = registration["Ticket Type"]
+        capacity = TICKET_CAPACITY.get(ticket)
+        if capacity is not None and self.ticket_counts[ticket] >= capacity:
+            raise RegistrationRejected(f"{ticket} tickets are sold out.")
+        email = normalize_email(registration["Email"])
+        duplicate = self.is_registered(email)
+        if duplicate and DUPLICATE_POLICY == "reject":
+            raise RegistrationRejected(f"{registration['Email']} is already registered.")
+        self._add_email(email)
+        self.uncommitted.add(email)
+        self.ticket_counts[ticket] += 1
+        return duplicate
+
+    # The admitted registrations were stored (committed) or not (rolled back)
+    def committed(self):
+        self.uncommitted.clear()
+
+    def rolled_back(self, registrations):
+        for registration in registrations:
+            email = normalize_email(registration["Email"])
+            if self.bloom is None:
+                self.emails.discard(email)  # a Bloom filter cannot forget; the confirm step covers it
+            self.ticket_counts[registration["Ticket Type"]] -= 1
+        self.uncommitted.clear()
+
+def build_registration_index(backend, db=None):
+    if backend == "sqlite":
+        ticket_counts = db.ticket_counts()
+        load_emails = db.emails
+        confirm = db.has_email
+    else:
+        emails = []
+        ticket_counts = Counter()
+        if os.path.exists(REGISTRATIONS_FILE):
+            with open(REGISTRATIONS_FILE, newline="", encoding="utf-8") as file:
+                for row in csv.DictReader(file):
+                    emails.append(row.get("Email") or "")
+                    ticket_counts[row.get("Ticket Type") or ""] += 1
+        load_emails = lambda: emails
+        confirm = None
+    if not USE_BLOOM_FILTER:
+        return RegistrationIndex(load_emails(), ticket_counts)
+    new_filter = not os.path.exists(BLOOM_FILE)
+    bloom = BloomFilter(BLOOM_FILE, BLOOM_CAPACITY, BLOOM_ERROR_RATE)
+    return RegistrationIndex(load_emails() if new_filter else [], ticket_counts, bloom, confirm)
+
+# Group-commit writer: the only thread that writes registrations. Sessions
+# hand their registration to submit() and block until it is stored; the
+# writer gathers everything that arrives within GROUP_COMMIT_INTERVAL and
+# stores it in one transaction (SQLite) or one append (CSV). Because it is the
+# only writer it also hands out registration IDs from a counter: R0000001,
+# R0000002, ... which can never repeat, and runs the duplicate and capacity
+# checks, so two sessions can never both take the last ticket.
+class RegistrationWriter:
+    def __init__(self, backend, db=None):
+        self.backend = backend
+        if backend == "sqlite":
+            db = db if db is not None else open_registration_db()
+            self.store = db.add_many
+            self.sequence = db.max_sequence()
+        else:
+            self.store = lambda registrations: append_registrations_csv(REGISTRATIONS_FILE, registrations)
+            self.sequence = csv_max_sequence(REGISTRATIONS_FILE)
+        self.index = build_registration_index(backend, db)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="registration-writer", daemon=True)
+        self.thread.start()
+
+    # Store one registration (without an ID); returns it with its Registration ID
+    # and a "Duplicate" flag, or raises RegistrationRejected. The email is stored
+    # as typed; only the duplicate checks use its normalized form.
+    def submit(self, registration):
+        registration = dict(registration)
+        future = Future()
+        self.queue.put((registration, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + GROUP_COMMIT_INTERVAL
+            while len(batch) < GROUP_COMMIT_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            except Exception as e:
+                # The writer must outlive any failure, or every later submit()
+                # would wait forever: fail whatever this batch left unanswered
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _commit(self, batch):
+        first = self.sequence
+        accepted = []
+        for registration, future in batch:
+            try:
+                registration["Duplicate"] = self.index.admit(registration)
+            except Exception as e:  # rejected, or the lookup itself failed (e.g. sqlite3.Error)
+                future.set_exception(e)
+                continue
+            self.sequence += 1
+            registration["Registration ID"] = f"R{self.sequence:07d}"
+            accepted.append((registration, future))
+        if not accepted:
+            return
+        registrations = [registration for registration, _ in accepted]
+        try:
+            self.store(registrations)
+        except Exception as e:
+            self.sequence = first  # nothing was stored, so the IDs are free again
+            self.index.rolled_back(registrations)
+            for _, future in accepted:
+                future.set_exception(e)
+            return
+        self.index.committed()
+        for registration, future in accepted:
+            future.set_result(registration)
+
+# Step 3: The submission path, shared by the web form and the benchmark
+# SMTP without the SMTPUTF8 extension only carries ASCII addresses
+def is_valid_email(email):
+    return "@" in email and "." in email and email.isascii()
+
+# Validate a form submission and store it through the writer; returns the
+# stored registration or raises RegistrationRejected with a message for the user
+def register(writer, name, email, ticket_type, comments=""):
+    if not name or not email:
+        raise RegistrationRejected("Please fill in all required fields: Name and Email.")
+    if not is_valid_email(email):
+        raise RegistrationRejected("Please enter a valid email address.")
+    return writer.submit({
+        "Name": name,
+        "Email": email,
+        "Ticket Type": ticket_type,
+        "Comments": comments,
+        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+def send_confirmation(dispatcher, registration):
+    body = f"""
+    Hi {registration['Name']},
+
+    Thank you for registering for our event!
+    Registration ID: {registration['Registration ID']}
+    Ticket Type: {registration['Ticket Type']}
+    Comments: {registration['Comments'] if registration['Comments'] else 'None'}
+    Timestamp: {registration['Timestamp']}
+
+    We look forward to seeing you!
+
+    Best regards,
+    Event Team
+    """
+    dispatcher.enqueue(registration["Email"], "Event Registration Confirmation", body)
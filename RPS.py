@@ -3,10 +3,42 @@
 import streamlit as st
 import random
 import time
+import html
+import json
+import os
+from collections import deque, Counter
 from datetime import datetime
 
 st.set_page_config(page_title="Rock Paper Scissors — Upgraded", layout="centered")
 
+# How a round's result is revealed: animated by the browser (the script run
+# finishes at once) or the original server-side spinner and pauses
+REVEAL_MODES = ["Animated (in browser)", "Classic (server pause)"]
+REVEAL_SECONDS = 0.9
+
+# Only the newest HISTORY_SIZE rounds are kept in the session; every round
+# is also appended to HISTORY_FILE (one JSON object per line) for lifetime stats
+HISTORY_SIZE = 10
+HISTORY_FILE = "rps_history.jsonl"
+
+# Styles for the in-browser reveal: the shaking fists show for
+# REVEAL_SECONDS, then the result fades in
+REVEAL_STYLE = f"""
+<style>
+.rps-reveal {{ display: grid; margin: 0.5rem 0 1rem; }}
+.rps-reveal > div {{ grid-area: 1 / 1; padding: 0.75rem 1rem; border-radius: 0.5rem; }}
+.rps-shuffle {{ font-size: 1.6rem; animation: rps-hide 0s linear {REVEAL_SECONDS}s forwards; }}
+.rps-shuffle span {{ display: inline-block; animation: rps-shake 0.25s ease-in-out 3; }}
+.rps-result {{ opacity: 0; animation: rps-show 0.3s ease-out {REVEAL_SECONDS}s forwards; }}
+.rps-success {{ background: rgba(33, 195, 84, 0.15); color: rgb(23, 114, 51); }}
+.rps-error {{ background: rgba(255, 43, 43, 0.12); color: rgb(125, 53, 59); }}
+.rps-info {{ background: rgba(28, 131, 225, 0.12); color: rgb(0, 66, 128); }}
+@keyframes rps-shake {{ 50% {{ transform: translateY(-0.4rem); }} }}
+@keyframes rps-hide {{ to {{ visibility: hidden; }} }}
+@keyframes rps-show {{ from {{ opacity: 0; transform: scale(0.9); }} to {{ opacity: 1; transform: none; }} }}
+</style>
+"""
+
 # -------------------------
 # Compatibility helper for rerun
 # -------------------------
@@ -34,7 +66,9 @@ def init_state():
     if "scores" not in st.session_state:
         st.session_state.scores = {"Player 1": 0, "Player 2": 0, "Computer": 0, "Draws": 0}
     if "history" not in st.session_state:
-        st.session_state.history = []  # list of dicts
+        st.session_state.history = deque(maxlen=HISTORY_SIZE)  # newest first
+    if "lifetime" not in st.session_state:
+        st.session_state.lifetime = load_lifetime_stats()  # rounds per (mode, winner label), from the log
     if "current_round" not in st.session_state:
         st.session_state.current_round = 1
     if "player_turn" not in st.session_state:
@@ -43,6 +77,21 @@ def init_state():
         st.session_state.match_over = False
     if "last_result" not in st.session_state:
         st.session_state.last_result = None  # store last round result dict
+    if "reveal_mode" not in st.session_state:
+        st.session_state.reveal_mode = REVEAL_MODES[0]
+
+def load_lifetime_stats():
+    stats = Counter()
+    if not os.path.exists(HISTORY_FILE):
+        return stats
+    with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+                stats[rec["Mode"], rec["Winner"]] += 1
+            except (ValueError, KeyError, TypeError):
+                continue  # skip a damaged or half-written line
+    return stats
 
 def choice_emoji(choice):
     return {"Rock": "✊", "Paper": "✋", "Scissors": "✌️"}.get(choice, "")
@@ -70,12 +119,18 @@ def record_round(winner_label, p1_choice, p2_choice, p1_name="Player 1", p2_name
         "P2": f"{choice_emoji(p2_choice)} {p2_choice}",
         "Winner": winner_label
     }
-    st.session_state.history.insert(0, rec)
+    st.session_state.history.appendleft(rec)
     st.session_state.last_result = rec
+    st.session_state.lifetime[st.session_state.mode, winner_label] += 1
+    try:
+        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(dict(rec, Mode=st.session_state.mode), ensure_ascii=False) + "\n")
+    except OSError as e:
+        st.warning(f"Could not save this round to {HISTORY_FILE}: {e}")
 
 def reset_match():
     st.session_state.scores = {"Player 1": 0, "Player 2": 0, "Computer": 0, "Draws": 0}
-    st.session_state.history = []
+    st.session_state.history = deque(maxlen=HISTORY_SIZE)
     st.session_state.current_round = 1
     st.session_state.player_turn = 1
     st.session_state.match_over = False
@@ -97,10 +152,39 @@ def animated_reveal():
             time.sleep(0.25)
     time.sleep(0.15)
 
+def celebrate():
+    """
+    Balloons for a won match. They fly as soon as the script run ends, which in
+    the animated mode is before the result is revealed, so only the classic mode
+    shows them.
+    """
+    if st.session_state.reveal_mode == REVEAL_MODES[1]:
+        st.balloons()
+
+def show_result(kind, message, animate=True):
+    """
+    Show a result as st.success / st.error / st.info would ("success", "error", "info").
+    In the animated mode the browser plays the reveal, so this returns at once;
+    every result of the round fades in together when it ends. In the classic
+    mode the reveal pauses the script run first (animate=False skips it).
+    """
+    if st.session_state.reveal_mode == REVEAL_MODES[1]:
+        if animate:
+            animated_reveal()
+        {"success": st.success, "error": st.error, "info": st.info}[kind](message)
+        return
+    shuffle = '<div class="rps-shuffle"><span>✊</span> <span>✊</span></div>' if animate else ""
+    st.markdown(
+        f'<div class="rps-reveal">{shuffle}<div class="rps-result rps-{kind}">{html.escape(message)}</div></div>',
+        unsafe_allow_html=True,
+    )
+
 # -------------------------
 # Initialize state
 # -------------------------
 init_state()
+if st.session_state.reveal_mode == REVEAL_MODES[0]:
+    st.markdown(REVEAL_STYLE, unsafe_allow_html=True)
 
 # -------------------------
 # Page UI
@@ -115,6 +199,11 @@ with st.expander("Game Settings", expanded=True):
         mode = st.selectbox("Mode", ["Single Player", "Two Player (Local)"], index=0 if st.session_state.mode=="Single Player" else 1)
     with col_b:
         bo = st.selectbox("Best of", [1,3,5,7,9], index=[1,3,5,7,9].index(st.session_state.best_of) if st.session_state.best_of in [1,3,5,7,9] else 1)
+    reveal = st.radio("Result reveal", REVEAL_MODES, index=REVEAL_MODES.index(st.session_state.reveal_mode), horizontal=True)
+    if reveal != st.session_state.reveal_mode:
+        # Takes effect right away; the match is not reset
+        st.session_state.reveal_mode = reveal
+        rerun_app()
     if st.button("Apply Settings"):
         st.session_state.mode = mode
         st.session_state.best_of = bo
@@ -161,7 +250,6 @@ if st.session_state.mode == "Single Player":
         player_choice = "Scissors"
 
     if player_choice and not st.session_state.match_over:
-        animated_reveal()
         comp_choice = random.choice(["Rock", "Paper", "Scissors"])
         result, desc = compute_result(player_choice, comp_choice, p1_label="You", p2_label="Computer")
         if result == "Win":
@@ -177,22 +265,22 @@ if st.session_state.mode == "Single Player":
         record_round(winner_label, player_choice, comp_choice, p1_name="You", p2_name="Computer")
 
         if result == "Win":
-            st.success(f"You Win! {desc}")
+            show_result("success", f"You Win! {desc}")
         elif result == "Lose":
-            st.error(f"You Lose! {desc}")
+            show_result("error", f"You Lose! {desc}")
         else:
-            st.info(f"Draw! {desc}")
+            show_result("info", f"Draw! {desc}")
 
         st.session_state.current_round += 1
         check_match_over()
         if st.session_state.match_over:
             if st.session_state.scores.get("You", 0) > st.session_state.scores.get("Computer", 0):
-                st.balloons()
-                st.success(f"Match Over — You win Best of {st.session_state.best_of}!")
+                celebrate()
+                show_result("success", f"Match Over — You win Best of {st.session_state.best_of}!", animate=False)
             elif st.session_state.scores.get("You", 0) < st.session_state.scores.get("Computer", 0):
-                st.error(f"Match Over — Computer wins Best of {st.session_state.best_of}!")
+                show_result("error", f"Match Over — Computer wins Best of {st.session_state.best_of}!", animate=False)
             else:
-                st.info("Match Over — It's a tie!")
+                show_result("info", "Match Over — It's a tie!", animate=False)
 
 # Two Player Local Mode
 else:
@@ -229,20 +317,19 @@ else:
                 st.error("Player 1 choice missing. Resetting turn.")
                 st.session_state.player_turn = 1
             else:
-                animated_reveal()
                 comp_result = decide_winner(p1_choice_val, p2_choice)
                 if comp_result == "Draw":
                     winner_label = "Draw"
                     st.session_state.scores["Draws"] = st.session_state.scores.get("Draws", 0) + 1
-                    st.info(f"Draw! {choice_emoji(p1_choice_val)} = {choice_emoji(p2_choice)}")
+                    show_result("info", f"Draw! {choice_emoji(p1_choice_val)} = {choice_emoji(p2_choice)}")
                 elif comp_result == "Player1":
                     winner_label = "Player 1"
                     st.session_state.scores["Player 1"] = st.session_state.scores.get("Player 1", 0) + 1
-                    st.success(f"Player 1 wins! {choice_emoji(p1_choice_val)} beats {choice_emoji(p2_choice)}")
+                    show_result("success", f"Player 1 wins! {choice_emoji(p1_choice_val)} beats {choice_emoji(p2_choice)}")
                 else:
                     winner_label = "Player 2"
                     st.session_state.scores["Player 2"] = st.session_state.scores.get("Player 2", 0) + 1
-                    st.error(f"Player 2 wins! {choice_emoji(p2_choice)} beats {choice_emoji(p1_choice_val)}")
+                    show_result("error", f"Player 2 wins! {choice_emoji(p2_choice)} beats {choice_emoji(p1_choice_val)}")
 
                 record_round(winner_label, p1_choice_val, p2_choice, p1_name="Player 1", p2_name="Player 2")
 
@@ -253,12 +340,12 @@ else:
                 check_match_over()
                 if st.session_state.match_over:
                     if st.session_state.scores.get("Player 1", 0) > st.session_state.scores.get("Player 2", 0):
-                        st.balloons()
-                        st.success(f"Match Over — Player 1 wins Best of {st.session_state.best_of}!")
+                        celebrate()
+                        show_result("success", f"Match Over — Player 1 wins Best of {st.session_state.best_of}!", animate=False)
                     elif st.session_state.scores.get("Player 1", 0) < st.session_state.scores.get("Player 2", 0):
-                        st.success(f"Match Over — Player 2 wins Best of {st.session_state.best_of}!")
+                        show_result("success", f"Match Over — Player 2 wins Best of {st.session_state.best_of}!", animate=False)
                     else:
-                        st.info("Match Over — It's a tie!")
+                        show_result("info", "Match Over — It's a tie!", animate=False)
 
 st.markdown("---")
 
@@ -267,11 +354,22 @@ st.subheader("Recent Rounds")
 if not st.session_state.history:
     st.info("No rounds played yet.")
 else:
-    hist = st.session_state.history[:10]
-    st.table(hist)
+    st.table(st.session_state.history)
+
+# Lifetime stats for the current mode, from every round in the log
+labels = ["You", "Computer"] if st.session_state.mode == "Single Player" else ["Player 1", "Player 2"]
+lifetime = {label: st.session_state.lifetime[st.session_state.mode, label] for label in labels + ["Draw"]}
+total_rounds = sum(lifetime.values())
+if total_rounds:
+    st.subheader(f"Lifetime Stats — {st.session_state.mode}")
+    l1, l2, l3, l4 = st.columns(4)
+    l1.metric("Rounds played", total_rounds)
+    l2.metric(f"{labels[0]} wins", lifetime[labels[0]])
+    l3.metric(f"{labels[1]} wins", lifetime[labels[1]])
+    l4.metric("Draws", lifetime["Draw"])
 
 st.markdown("---")
 st.write("Tips:")
 st.write("- Use Best-of to set the match length (e.g., Best of 3 means first to 2 wins).")
 st.write("- In Two-player local mode, Player 1 chooses first, then Player 2. Keep choices private between turns.")
-st.write("- Click Reset Match to clear scores and history.")
+st.write("- Click Reset Match to clear scores and recent rounds. Lifetime stats are kept.")